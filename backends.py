@@ -0,0 +1,219 @@
+# backends.py
+# 추론 백엔드: fastai Learner 그대로 / TorchScript 아티팩트(float, int8)
+# 모든 백엔드는 같은 인터페이스를 가진다:
+#   vocab: list[str]
+#   input_size: (h, w) | None — preprocess.decode_image의 축소 디코딩 기준
+#   prepare(pil) -> 모델 입력 (배치로 묶을 수 있는 단위)
+#   predict_batch(list[입력]) -> list[Prediction]
+#   transforms_in_batch: True면 전처리 변환이 prepare()가 아니라 predict_batch() 안에서 일어남
+#                        (그때는 백엔드가 metrics에 "transforms"를 직접 기록)
+import copy
+import json
+import os
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from prediction_cache import Prediction
+from timing import stage_of
+
+BACKENDS = ("learner", "torchscript", "torchscript-int8")
+_ARTIFACT_SUFFIX = {"torchscript": ".ts.pt", "torchscript-int8": ".int8.ts.pt"}
+
+
+def artifact_path(model_path: str, backend: str) -> str:
+    """model.pkl → model.ts.pt / model.int8.ts.pt"""
+    return os.path.splitext(model_path)[0] + _ARTIFACT_SUFFIX[backend]
+
+
+def available_backends(model_path: str) -> list[str]:
+    return ["learner"] + [b for b in BACKENDS[1:] if os.path.exists(artifact_path(model_path, b))]
+
+
+def _to_prediction(vocab: list[str], p: np.ndarray) -> Prediction:
+    idx = int(p.argmax())
+    return Prediction(vocab[idx], idx, p)
+
+
+class LearnerBackend:
+    """fastai Learner의 test_dl 경로 (변환 파이프라인 전체 사용).
+
+    item/batch 변환(Resize, ToTensor, IntToFloat, Normalize)은 배치를 만들 때 스케줄러 스레드에서 돌기 때문에
+    metrics(timing.StageMetrics)를 주면 그 시간을 배치 단위 "transforms"로 따로 기록한다.
+    """
+
+    name = "learner"
+    transforms_in_batch = True
+
+    def __init__(self, learner, metrics=None):
+        self.learner = learner
+        self.metrics = metrics
+        self.vocab = [str(x) for x in learner.dls.vocab]
+        try:
+            self.input_size = tuple(preprocess_spec(learner)["size"])
+        except ValueError:
+            self.input_size = None
+
+    def prepare(self, pil: Image.Image) -> Image.Image:
+        # PILImage.create는 PIL 이미지를 복사 없이 감싸므로 numpy로 왕복하지 않는다
+        return pil
+
+    def predict_batch(self, imgs: list) -> list[Prediction]:
+        import torch
+        with stage_of(self.metrics, "transforms"):
+            dl = self.learner.dls.test_dl(imgs, bs=len(imgs), num_workers=0)
+            xb = dl.one_batch()[0]   # 변환이 모두 적용된 입력 텐서
+        with torch.no_grad():
+            out = self.learner.model.eval()(xb)
+        # get_preds와 같은 후처리: 손실 함수의 activation (CrossEntropyLossFlat → softmax)
+        act = getattr(self.learner.loss_func, "activation", None)
+        probs = act(out) if callable(act) else out
+        return [_to_prediction(self.vocab, p) for p in probs.float().cpu().numpy()]
+
+
+# ======================
+# 전처리 사양 (learner.dls에서 추출)
+# ======================
+def preprocess_spec(learner) -> dict:
+    """검증 시점의 리사이즈/정규화 설정을 learner.dls에서 읽어옴."""
+    size, method = None, "crop"
+    for t in learner.dls.after_item.fs:
+        s = getattr(t, "size", None)
+        if s is not None:
+            # fastai Resize/RandomResizedCrop은 size를 (w, h)로 저장함 (_process_sz) → (h, w)로 뒤집음
+            size = (s, s) if isinstance(s, int) else (int(s[1]), int(s[0]))
+            method = str(getattr(t, "method", "crop"))
+    if size is None:
+        raise ValueError("learner.dls에 Resize 계열 item transform이 없어 입력 크기를 알 수 없습니다.")
+    mean, std = [0.0, 0.0, 0.0], [1.0, 1.0, 1.0]
+    for t in learner.dls.after_batch.fs:
+        if type(t).__name__ == "Normalize":
+            mean = [float(v) for v in t.mean.flatten()]
+            std = [float(v) for v in t.std.flatten()]
+    return {"size": list(size), "method": method, "mean": mean, "std": std,
+            "vocab": [str(x) for x in learner.dls.vocab]}
+
+
+def prepare_image(pil: Image.Image, size: tuple[int, int], method: str = "crop") -> np.ndarray:
+    """fastai Resize(검증 시점)와 같은 방식으로 (h, w) 크기의 uint8 HWC 배열 생성.
+
+    pad는 fastai 기본값(reflection) 대신 검은색으로 채우므로 약간 차이가 날 수 있다.
+    """
+    h, w = size
+    if method == "squish":
+        out = pil.resize((w, h), Image.BILINEAR)
+    elif method == "pad":
+        out = ImageOps.pad(pil, (w, h), Image.BILINEAR)
+    else:
+        out = ImageOps.fit(pil, (w, h), Image.BILINEAR)
+    return np.asarray(out)
+
+
+# ======================
+# TorchScript 내보내기 / 로드
+# ======================
+def _wrap_with_preprocess(model, mean, std):
+    import torch
+    from torch import nn
+
+    class Preprocessed(nn.Module):
+        """uint8 NHWC 입력 → 정규화 → 모델 → softmax (단일 라벨 분류 가정)."""
+
+        def __init__(self):
+            super().__init__()
+            self.model = model
+            self.register_buffer("mean", torch.tensor(mean).view(1, 3, 1, 1))
+            self.register_buffer("std", torch.tensor(std).view(1, 3, 1, 1))
+
+        def forward(self, x):
+            x = x.permute(0, 3, 1, 2).float().div(255.0)
+            x = (x - self.mean) / self.std
+            return torch.softmax(self.model(x), dim=1)
+
+    return Preprocessed().eval()
+
+
+def _normalized(imgs: list[np.ndarray], mean, std):
+    import torch
+    x = torch.from_numpy(np.stack(imgs)).permute(0, 3, 1, 2).float().div(255.0)
+    return (x - torch.tensor(mean).view(1, 3, 1, 1)) / torch.tensor(std).view(1, 3, 1, 1)
+
+
+def export_torchscript(learner, path: str, quantize: str | None = None,
+                       calib: list[np.ndarray] | None = None) -> dict:
+    """learner.model + 전처리를 TorchScript 아티팩트로 저장.
+
+    quantize: None | "dynamic" (Linear만 int8) | "static" (FX 그래프 모드, calib 필요)
+    calib: prepare_image()로 만든 uint8 HWC 배열 목록 (static 보정용).
+    """
+    import torch
+    from torch import nn
+
+    spec = preprocess_spec(learner)
+    h, w = spec["size"]
+    model = copy.deepcopy(learner.model).cpu().eval()
+
+    if quantize == "dynamic":
+        model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    elif quantize == "static":
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+        if not calib:
+            raise ValueError("static 양자화에는 보정용 이미지(calib)가 필요합니다.")
+        torch.backends.quantized.engine = "fbgemm"
+        model = prepare_fx(model, get_default_qconfig_mapping("fbgemm"), (torch.zeros(1, 3, h, w),))
+        with torch.inference_mode():
+            for i in range(0, len(calib), 16):
+                model(_normalized(calib[i:i + 16], spec["mean"], spec["std"]))
+        model = convert_fx(model)
+    elif quantize is not None:
+        raise ValueError(f"알 수 없는 quantize 옵션: {quantize!r}")
+
+    wrapped = _wrap_with_preprocess(model, spec["mean"], spec["std"])
+    with torch.no_grad():
+        traced = torch.jit.trace(wrapped, torch.zeros(2, h, w, 3, dtype=torch.uint8))
+    try:
+        traced = torch.jit.freeze(traced)
+    except RuntimeError:
+        pass
+
+    meta = dict(spec, quantize=quantize)
+    tmp = path + ".tmp"
+    torch.jit.save(traced, tmp, _extra_files={"meta.json": json.dumps(meta, ensure_ascii=False)})
+    os.replace(tmp, path)
+    return meta
+
+
+class TorchScriptBackend:
+    """export_torchscript()로 만든 아티팩트를 Learner 없이 바로 실행."""
+
+    def __init__(self, path: str, name: str = "torchscript"):
+        import torch
+        extra = {"meta.json": ""}
+        self.module = torch.jit.load(path, map_location="cpu", _extra_files=extra)
+        self.module.eval()
+        self.meta = json.loads(extra["meta.json"])
+        self.name = name
+        self.vocab = list(self.meta["vocab"])
+        self.input_size = tuple(self.meta["size"])
+        self.method = self.meta["method"]
+
+    def prepare(self, pil: Image.Image) -> np.ndarray:
+        return prepare_image(pil, self.input_size, self.method)
+
+    def predict_batch(self, imgs: list[np.ndarray]) -> list[Prediction]:
+        import torch
+        with torch.inference_mode():
+            probs = self.module(torch.from_numpy(np.stack(imgs))).numpy()
+        return [_to_prediction(self.vocab, p) for p in probs]
+
+
+def load_backend(name: str, learner, model_path: str, metrics=None):
+    if name == "learner":
+        return LearnerBackend(learner, metrics=metrics)
+    if name in _ARTIFACT_SUFFIX:
+        backend = TorchScriptBackend(artifact_path(model_path, name), name=name)
+        if backend.vocab != [str(x) for x in learner.dls.vocab]:
+            raise ValueError(f"{name} 아티팩트의 라벨이 현재 모델과 다릅니다. export_model.py로 다시 내보내세요.")
+        return backend
+    raise ValueError(f"알 수 없는 백엔드: {name!r}")
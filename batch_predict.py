@@ -0,0 +1,136 @@
+# batch_predict.py
+# 일괄 분류: 여러 파일/zip 업로드 → 제너레이터로 디코딩 → 백엔드 배치 추론
+import os
+import zipfile
+import zlib
+from itertools import islice
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from prediction_cache import Prediction, PredictionCache, image_digest, prediction_key
+from preprocess import MAX_UPLOAD_BYTES
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".tiff", ".tif"}
+
+
+class BatchRow(NamedTuple):
+    name: str
+    pred: Prediction | None
+    error: str | None = None
+
+
+def _is_image_name(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTS
+
+
+def _zip_image_members(zf: zipfile.ZipFile):
+    for info in zf.infolist():
+        base = os.path.basename(info.filename)
+        if info.is_dir() or base.startswith(".") or "__MACOSX" in info.filename:
+            continue
+        if _is_image_name(info.filename):
+            yield info
+
+
+def count_upload_images(files) -> int:
+    """진행률 표시용: 업로드 파일(zip 내부 포함)의 이미지 개수. zip은 목차만 읽음."""
+    n = 0
+    for f in files:
+        if f.name.lower().endswith(".zip"):
+            f.seek(0)
+            try:
+                with zipfile.ZipFile(f) as zf:
+                    n += sum(1 for _ in _zip_image_members(zf))
+            except zipfile.BadZipFile:
+                n += 1   # 오류 행 하나로 표시됨
+        else:
+            n += 1
+    return n
+
+
+def iter_upload_bytes(files, max_bytes: int = MAX_UPLOAD_BYTES) -> Iterator[tuple[str, bytes | Exception]]:
+    """업로드 파일들을 (이름, 바이트)로 하나씩 흘려보냄. zip은 멤버 단위로 읽음.
+
+    zip 멤버는 max_bytes + 1 바이트까지만 풀어서, 압축 폭탄도 디코딩 단계에서 크기 초과로 걸러진다.
+    열 수 없는 zip이나 깨진 멤버는 바이트 대신 예외를 보내 predict_batches에서 오류 행이 되게 한다.
+    """
+    for f in files:
+        if f.name.lower().endswith(".zip"):
+            f.seek(0)
+            try:
+                zf = zipfile.ZipFile(f)
+            except zipfile.BadZipFile as e:
+                yield f.name, e
+                continue
+            with zf:
+                for info in _zip_image_members(zf):
+                    try:
+                        with zf.open(info) as member:
+                            data = member.read(max_bytes + 1)
+                    # 손상/압축 오류, 암호화된 멤버(RuntimeError), 지원하지 않는 압축 방식(NotImplementedError)
+                    except (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError) as e:
+                        data = e
+                    yield f"{f.name}/{info.filename}", data
+        else:
+            yield f.name, f.getvalue()
+
+
+def chunked(it: Iterable, n: int) -> Iterator[list]:
+    it = iter(it)
+    while chunk := list(islice(it, n)):
+        yield chunk
+
+
+def predict_batches(
+    items: Iterable[tuple[str, bytes | Exception]],
+    prepare: Callable,
+    predict_fn: Callable[[list], list[Prediction]],
+    batch_size: int = 32,
+    cache: PredictionCache | None = None,
+    model_id: str = "",
+) -> Iterator[list[BatchRow]]:
+    """batch_size 단위로 추론한 결과를 청크마다 yield (진행률 갱신용).
+
+    prepare는 바이트를 모델 입력으로 바꾸고, predict_fn은 그 목록을 받아 Prediction 목록을
+    반환한다 (백엔드의 predict_batch 또는 InferenceScheduler.predict_many).
+    캐시에 있는 이미지는 추론을 건너뛰고, 새로 계산한 결과는 캐시에 저장한다.
+    읽기/디코딩에 실패한 파일은 error가 채워진 행으로 반환한다.
+    """
+    for chunk in chunked(items, batch_size):
+        rows: list[BatchRow | None] = [None] * len(chunk)
+        pending, keys, imgs = [], [], []
+        for i, (name, b) in enumerate(chunk):
+            if isinstance(b, Exception):   # iter_upload_bytes가 읽지 못한 zip/멤버
+                rows[i] = BatchRow(name, None, f"{type(b).__name__}: {b}")
+                continue
+            key = prediction_key(image_digest(b), model_id)
+            hit = cache.get(key) if cache is not None else None
+            if hit is not None:
+                rows[i] = BatchRow(name, hit)
+                continue
+            try:
+                img = prepare(b)
+            except Exception as e:  # 깨진 파일 하나 때문에 배치 전체가 실패하지 않도록
+                rows[i] = BatchRow(name, None, f"{type(e).__name__}: {e}")
+                continue
+            pending.append(i); keys.append(key); imgs.append(img)
+
+        if imgs:
+            for i, key, pred in zip(pending, keys, predict_fn(imgs)):
+                if cache is not None:
+                    pred = cache.put(key, pred)
+                rows[i] = BatchRow(chunk[i][0], pred)
+        yield rows
+
+
+def rows_to_records(rows: Iterable[BatchRow], labels: list[str]) -> list[dict]:
+    """결과 테이블/CSV용 레코드. 라벨별 확률은 확률 막대와 같은 % 단위."""
+    records = []
+    for r in rows:
+        rec = {"파일": r.name, "예측": None, "확률(%)": None, "오류": r.error or ""}
+        if r.pred is not None:
+            rec["예측"] = r.pred.label
+            rec["확률(%)"] = float(r.pred.probs[r.pred.idx]) * 100
+            for lbl, p in zip(labels, r.pred.probs):
+                rec[lbl] = float(p) * 100
+        records.append(rec)
+    return records
@@ -0,0 +1,201 @@
+# benchmark.py
+# 앱과 같은 파이프라인(디코딩 → 변환 → 추론 → 확률 정렬 → HTML 렌더링)을 헤드리스로 돌려
+# 단계별 지연시간 백분위와 처리량을 보고한다. 배포 전 성능 회귀 확인용.
+#
+# 사용법:
+#   python benchmark.py                                   # 스텁 모델, 합성 이미지
+#   python benchmark.py --stub-forward-ms 40 --concurrency 8
+#   python benchmark.py --model model.pkl --backend torchscript-int8 --json bench.json
+#   python benchmark.py --max-p95-ms 150                  # p95가 넘으면 종료 코드 1
+import argparse
+import json
+import sys
+import threading
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from backends import prepare_image
+from inference_scheduler import InferenceScheduler
+from prediction_cache import Prediction
+from preprocess import decode_image
+from render import prob_panel_html, top_probs
+from timing import StageMetrics, Trace, stage_of
+
+
+class StubBackend:
+    """모델 없이 파이프라인 나머지 비용을 재기 위한 가짜 백엔드 (forward_ms만큼 대기).
+
+    transforms_in_batch=True(기본)면 기본 learner 백엔드처럼 리사이즈+정규화를 predict_batch 안에서 하고
+    metrics에 "transforms"로 기록한다. False면 TorchScript 백엔드처럼 prepare()에서 리사이즈한다.
+    """
+
+    name = "stub"
+
+    def __init__(self, n_labels: int = 4, input_size=(224, 224), forward_ms: float = 0.0, seed: int = 0,
+                 transforms_in_batch: bool = True, metrics=None):
+        self.vocab = [f"label{i}" for i in range(n_labels)]
+        self.input_size = tuple(input_size)
+        self.forward_ms = forward_ms
+        self.transforms_in_batch = transforms_in_batch
+        self.metrics = metrics
+        self._rng = np.random.default_rng(seed)
+
+    def prepare(self, pil: Image.Image):
+        return pil if self.transforms_in_batch else prepare_image(pil, self.input_size)
+
+    def predict_batch(self, imgs: list) -> list[Prediction]:
+        if self.transforms_in_batch:
+            with stage_of(self.metrics, "transforms"):   # fastai Resize → ToTensor → IntToFloat → Normalize 흉내
+                x = np.stack([prepare_image(p, self.input_size) for p in imgs]).astype(np.float32) / 255
+                x = (x - 0.45) / 0.225
+        if self.forward_ms:
+            # 배치가 커질수록 이미지당 비용이 줄어드는 것을 흉내
+            time.sleep(self.forward_ms / 1000 * (1 + 0.15 * (len(imgs) - 1)))
+        probs = self._rng.dirichlet(np.ones(len(self.vocab)), size=len(imgs)).astype(np.float32)
+        return [Prediction(self.vocab[int(p.argmax())], int(p.argmax()), p) for p in probs]
+
+
+def synthetic_jpeg(w: int, h: int, seed: int, orientation: int = 1) -> bytes:
+    """그라디언트 + 노이즈 JPEG. orientation != 1이면 EXIF 회전 태그를 붙인다."""
+    rng = np.random.default_rng(seed)
+    gx = np.linspace(0, 255, w, dtype=np.float32)[None, :, None]
+    gy = np.linspace(0, 255, h, dtype=np.float32)[:, None, None]
+    arr = (gx * 0.5 + gy * 0.5 + rng.normal(0, 12, (h, w, 3))).clip(0, 255).astype(np.uint8)
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    buf = BytesIO()
+    Image.fromarray(arr).save(buf, "JPEG", quality=90, exif=exif.tobytes())
+    return buf.getvalue()
+
+
+def load_real_backend(model_path: str, name: str):
+    from fastai.vision.all import load_learner
+
+    from backends import load_backend
+    return load_backend(name, load_learner(model_path, cpu=True), model_path)
+
+
+def run_one(b: bytes, backend, predict, preview_max: int, metrics: StageMetrics, top_k: int | None = None) -> None:
+    trace = Trace(metrics)
+    t0 = time.perf_counter()
+    min_side = min(backend.input_size) if backend.input_size else None
+    work, _ = decode_image(b, min_side=min_side, preview_max=preview_max, trace=trace)
+    if getattr(backend, "transforms_in_batch", False):
+        x = backend.prepare(work)   # 변환은 predict_batch 안에서 metrics에 "transforms"로 기록됨
+    else:
+        with trace.stage("transforms"):
+            x = backend.prepare(work)
+    with trace.stage("predict"):
+        pred = predict(x)
+    with trace.stage("sort_probs"):
+        top = top_probs(backend.vocab, pred.probs, top_k)
+    with trace.stage("render_probs"):
+        prob_panel_html(top, pred.label, len(backend.vocab) - len(top))
+    trace.add("total", time.perf_counter() - t0)
+
+
+def run_size(images: list[bytes], backend, args) -> dict:
+    metrics = StageMetrics(window=max(len(images) * args.repeats, 1))
+    if hasattr(backend, "metrics"):
+        backend.metrics = None   # 워밍업은 기록하지 않음
+    jobs = images * args.repeats
+    scheduler = None
+    if args.concurrency > 0:
+        scheduler = InferenceScheduler(backend.predict_batch, max_batch_size=args.max_batch,
+                                       max_wait_ms=args.max_wait_ms, max_queue=len(jobs) + 1,
+                                       metrics=metrics)
+        predict = scheduler.predict
+    else:
+        predict = lambda x: backend.predict_batch([x])[0]
+
+    run_one(images[0], backend, predict, args.preview_max, StageMetrics())   # 워밍업 (기록 안 함)
+    if hasattr(backend, "metrics"):
+        backend.metrics = metrics
+    t0 = time.perf_counter()
+    if scheduler is None:
+        for b in jobs:
+            run_one(b, backend, predict, args.preview_max, metrics, args.top_k)
+    else:
+        it = iter(jobs)
+        lock = threading.Lock()
+
+        def client():
+            while True:
+                with lock:
+                    b = next(it, None)
+                if b is None:
+                    return
+                run_one(b, backend, predict, args.preview_max, metrics, args.top_k)
+
+        threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        scheduler.stop()
+    elapsed = time.perf_counter() - t0
+    out = {"images": len(jobs), "elapsed_s": elapsed, "img_per_s": len(jobs) / elapsed,
+           "stages": metrics.summary()}
+    if scheduler is not None:
+        out["scheduler"] = scheduler.stats()
+    return out
+
+
+def print_report(results: dict) -> None:
+    for size, r in results.items():
+        extra = f" · 평균 배치 {r['scheduler']['avg_batch']:.1f}" if "scheduler" in r else ""
+        print(f"\n[{size}] {r['images']}장 · {r['img_per_s']:.1f} img/s{extra}")
+        print(f"  {'stage':<16}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}{'max_ms':>10}")
+        for name, s in r["stages"].items():
+            print(f"  {name:<16}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="분류 파이프라인 오프라인 벤치마크")
+    ap.add_argument("--model", help="model.pkl 경로 (없으면 스텁 모델)")
+    ap.add_argument("--backend", default="learner", help="learner | torchscript | torchscript-int8")
+    ap.add_argument("--sizes", default="640x480,1920x1080,4032x3024", help="합성 이미지 크기 목록 (WxH)")
+    ap.add_argument("-n", type=int, default=8, help="크기별 서로 다른 이미지 수")
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--preview-max", type=int, default=512)
+    ap.add_argument("--concurrency", type=int, default=0, help="0이면 직접 호출, N이면 스케줄러 + N개 클라이언트 스레드")
+    ap.add_argument("--max-batch", type=int, default=16)
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    ap.add_argument("--stub-labels", type=int, default=4)
+    ap.add_argument("--top-k", type=int, default=10, help="확률 패널에 그리는 상위 라벨 수 (0이면 전체)")
+    ap.add_argument("--stub-forward-ms", type=float, default=0.0)
+    ap.add_argument("--stub-style", choices=["learner", "torchscript"], default="learner",
+                    help="스텁의 전처리 위치: learner(배치 안) | torchscript(prepare)")
+    ap.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    ap.add_argument("--max-p95-ms", type=float, help="total p95가 이 값을 넘으면 종료 코드 1")
+    args = ap.parse_args(argv)
+
+    if args.model:
+        backend = load_real_backend(args.model, args.backend)
+    else:
+        backend = StubBackend(args.stub_labels, forward_ms=args.stub_forward_ms,
+                              transforms_in_batch=args.stub_style == "learner")
+
+    results = {}
+    for size in args.sizes.split(","):
+        w, h = (int(v) for v in size.lower().split("x"))
+        images = [synthetic_jpeg(w, h, seed=i, orientation=6 if i % 2 else 1) for i in range(args.n)]
+        results[size] = run_size(images, backend, args)
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"backend": backend.name, "args": vars(args), "results": results}, f,
+                      ensure_ascii=False, indent=2)
+
+    if args.max_p95_ms is not None:
+        worst = max(r["stages"]["total"]["p95_ms"] for r in results.values())
+        if worst > args.max_p95_ms:
+            print(f"\nFAIL: total p95 {worst:.1f} ms > {args.max_p95_ms:.1f} ms", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# conftest.py
+# 저장소 루트를 import 경로에 넣어 tests/에서 앱 모듈(model_store 등)을 바로 import 하도록
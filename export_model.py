@@ -0,0 +1,147 @@
+# export_model.py
+# model.pkl → TorchScript 아티팩트(float / int8) 내보내기 + 정확도 일치 검사 + 지연시간/메모리 비교
+#
+# 사용법:
+#   python export_model.py                                         # models/ 의 최신 버전 model.pkl, float + dynamic int8
+#   python export_model.py --model models/<version>/model.pkl --quantize static --samples ./samples
+#
+# 아티팩트(model.ts.pt / model.int8.ts.pt)는 model.pkl 옆에 만들어진다. 앱은 자신이 받은 모델의
+# 버전 디렉터리(MODEL_CACHE_DIR/<version>/)에서만 찾으므로, 앱을 한 번 실행해 모델을 받은 뒤 내보낸다.
+# 그러면 사이드바의 "추론 백엔드"에서 선택할 수 있다.
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from backends import (LearnerBackend, TorchScriptBackend, artifact_path, export_torchscript,
+                      preprocess_spec, prepare_image)
+from model_store import ModelStore
+
+SAMPLE_EXTS = (".jpg", ".jpeg", ".png", ".webp", ".tiff", ".tif")
+
+
+def load_samples(folder: str | None, n: int, seed: int = 0) -> list[Image.Image]:
+    """샘플 폴더의 이미지 n장. 폴더가 없으면 크기가 제각각인 합성 이미지."""
+    if folder:
+        files = sorted(f for f in glob.glob(os.path.join(folder, "**", "*"), recursive=True)
+                       if f.lower().endswith(SAMPLE_EXTS))[:n]
+        return [ImageOps.exif_transpose(Image.open(f)).convert("RGB") for f in files]
+    rng = np.random.default_rng(seed)
+    sizes = [(320, 240), (640, 480), (1024, 768), (480, 640)]
+    return [Image.fromarray(rng.integers(0, 256, (*sizes[i % len(sizes)][::-1], 3), dtype=np.uint8))
+            for i in range(n)]
+
+
+def _rss_mb() -> tuple[float, bool]:
+    """(RSS MB, 최대값인지). psutil이 없으면 현재 RSS 대신 최대 RSS(ru_maxrss)만 알 수 있다."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20, False
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, True  # 리눅스: KB 단위
+
+
+def reference_probs(learner, pils) -> list[np.ndarray]:
+    """기준값: 앱이 원래 쓰던 learner.predict 결과."""
+    from fastai.vision.all import PILImage
+    return [learner.predict(PILImage.create(np.array(p)))[2].numpy() for p in pils]
+
+
+def parity(backend, pils, ref: list[np.ndarray], bs: int = 32) -> dict:
+    got = []
+    for i in range(0, len(pils), bs):
+        got += [p.probs for p in backend.predict_batch([backend.prepare(x) for x in pils[i:i + bs]])]
+    got, ref = np.stack(got), np.stack(ref)
+    diff = np.abs(got - ref)
+    return {
+        "top1_agree": float((got.argmax(1) == ref.argmax(1)).mean()),
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+    }
+
+
+def latency(backend, pils, repeats: int = 3, bs: int = 32) -> dict:
+    single = []
+    for _ in range(repeats):
+        for p in pils:
+            t0 = time.perf_counter()
+            backend.predict_batch([backend.prepare(p)])
+            single.append((time.perf_counter() - t0) * 1000)
+    t0 = time.perf_counter()
+    for i in range(0, len(pils), bs):
+        backend.predict_batch([backend.prepare(x) for x in pils[i:i + bs]])
+    batch_s = time.perf_counter() - t0
+    return {
+        "p50_ms": float(np.percentile(single, 50)),
+        "p95_ms": float(np.percentile(single, 95)),
+        "batch_img_per_s": len(pils) / batch_s if batch_s else float("inf"),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="model.pkl → TorchScript 아티팩트 내보내기 및 백엔드 비교")
+    ap.add_argument("--model", help="model.pkl 경로 (기본: --cache-dir 에서 가장 최근 버전)")
+    ap.add_argument("--cache-dir", default="models", help="앱의 MODEL_CACHE_DIR")
+    ap.add_argument("--filename", default="model.pkl", help="앱의 MODEL_PATH")
+    ap.add_argument("--samples", default=None, help="정확도 검사/보정용 이미지 폴더 (없으면 합성 이미지)")
+    ap.add_argument("-n", type=int, default=32, help="샘플 수")
+    ap.add_argument("--quantize", choices=["dynamic", "static", "none"], default="dynamic")
+    ap.add_argument("--bs", type=int, default=32)
+    ap.add_argument("--skip-export", action="store_true", help="기존 아티팩트로 비교만 수행")
+    args = ap.parse_args(argv)
+    if args.model is None:
+        args.model = ModelStore(args.cache_dir).latest(args.filename)
+        if args.model is None:
+            ap.error(f"{args.cache_dir}/<version>/{args.filename} 이 없습니다. 앱을 한 번 실행해 모델을 받거나 --model 을 지정하세요.")
+        print(f"model: {args.model}")
+
+    from fastai.vision.all import load_learner
+    pils = load_samples(args.samples, args.n)
+    rss0, peak_only = _rss_mb()
+    learner = load_learner(args.model, cpu=True)
+    learner_backend = LearnerBackend(learner)
+    learner_backend.predict_batch([learner_backend.prepare(pils[0])])  # 워밍업
+    learner_rss = _rss_mb()[0] - rss0   # 내보내기(트레이싱) 메모리가 섞이기 전에 측정
+    spec = preprocess_spec(learner)
+
+    targets = {"torchscript": None}
+    if args.quantize != "none":
+        targets["torchscript-int8"] = args.quantize
+    if not args.skip_export:
+        calib = [prepare_image(p, spec["size"], spec["method"]) for p in pils]
+        for name, q in targets.items():
+            path = artifact_path(args.model, name)
+            export_torchscript(learner, path, quantize=q, calib=calib)
+            print(f"exported {name:<17} → {path} ({os.path.getsize(path) / 2**20:.1f} MB)")
+
+    ref = reference_probs(learner, pils)
+    rows = []
+    for name in ["learner", *targets]:
+        if name == "learner":
+            backend, size, rss = learner_backend, os.path.getsize(args.model), learner_rss
+        else:
+            rss0 = _rss_mb()[0]
+            path = artifact_path(args.model, name)
+            backend, size = TorchScriptBackend(path, name=name), os.path.getsize(path)
+            backend.predict_batch([backend.prepare(pils[0])])  # 워밍업
+            rss = _rss_mb()[0] - rss0
+        rows.append({"backend": name, "size_mb": size / 2**20, "rss_delta_mb": rss,
+                     **parity(backend, pils, ref, args.bs), **latency(backend, pils, bs=args.bs)})
+
+    cols = ["backend", "size_mb", "rss_delta_mb", "top1_agree", "max_abs_diff", "mean_abs_diff",
+            "p50_ms", "p95_ms", "batch_img_per_s"]
+    print(" | ".join(f"{c:>15}" for c in cols))
+    for r in rows:
+        print(" | ".join(f"{r[c]:>15}" if isinstance(r[c], str) else f"{r[c]:>15.4f}" for c in cols))
+    if peak_only:
+        print("참고: psutil이 없어 rss_delta_mb는 최대 RSS(ru_maxrss)의 증가분입니다. "
+              "이전 최대치 안에서 로드된 백엔드는 0으로 보일 수 있습니다 (pip install psutil).")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
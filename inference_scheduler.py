@@ -0,0 +1,158 @@
+# inference_scheduler.py
+# 세션 간 공유 learner 앞단의 마이크로 배칭 스케줄러
+# 여러 세션의 요청을 큐에 모았다가 max_wait_ms 안에 도착한 것끼리 한 번에 추론한다.
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, NamedTuple
+
+
+class SchedulerBusy(RuntimeError):
+    """요청 큐가 가득 찼을 때 (backpressure)."""
+
+
+class _Slice(NamedTuple):
+    """predict_many의 한 조각: 다른 요청과 섞지 않고 그대로 한 번의 forward로 추론."""
+    items: list
+
+
+def configure_torch_threads(intra_op: int | None = None, inter_op: int | None = None) -> None:
+    """torch 스레드 수를 명시적으로 고정. 프로세스 전역 설정이므로 한 번만 호출."""
+    import torch
+    if intra_op:
+        torch.set_num_threads(int(intra_op))
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(int(inter_op))
+        except RuntimeError:
+            # 이미 병렬 작업이 시작된 뒤에는 바꿀 수 없음
+            pass
+
+
+class InferenceScheduler:
+    """단일 워커 스레드가 learner를 독점하고, 큐에 쌓인 요청을 묶어서 추론.
+
+    predict_batch는 입력 목록을 받아 같은 길이의 결과 목록을 반환해야 한다.
+    각 요청자는 submit()이 돌려준 Future로 자기 결과만 받는다.
+    백엔드마다 스케줄러를 두더라도 model_lock을 공유하면 forward는 프로세스 전체에서 한 번에 하나만 돈다
+    (각 forward가 torch 스레드를 모두 쓰므로 동시에 돌면 코어를 두고 경쟁함).
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[list], list],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        max_queue: int = 256,
+        name: str = "inference-scheduler",
+        metrics=None,
+        model_lock=None,
+    ):
+        self._predict_batch = predict_batch
+        self.metrics = metrics   # timing.StageMetrics: 배치 추론 시간(model_forward) 기록
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._q: queue.Queue[tuple[Any, Future]] = queue.Queue(maxsize=max(1, int(max_queue)))
+        # 다른 백엔드의 스케줄러와 공유하는 락: forward가 겹치지 않도록
+        self._model_lock = model_lock if model_lock is not None else threading.Lock()
+        self._stop = threading.Event()
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self._worker = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any, block: bool = False, timeout: float | None = None) -> Future:
+        fut: Future = Future()
+        try:
+            self._q.put((item, fut), block=block, timeout=timeout)
+        except queue.Full:
+            self.rejected += 1
+            raise SchedulerBusy("inference queue is full") from None
+        return fut
+
+    @staticmethod
+    def _result(fut: Future, timeout: float | None) -> Any:
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            # 아직 워커가 집어가지 않았으면 취소 → 기다리는 사람 없는 forward를 돌리지 않음
+            fut.cancel()
+            raise TimeoutError(f"inference did not finish within {timeout}s") from None
+
+    def predict(self, item: Any, timeout: float | None = None) -> Any:
+        """결과를 기다림. 큐가 가득 차면 SchedulerBusy, timeout을 넘기면 TimeoutError."""
+        return self._result(self.submit(item), timeout)
+
+    def predict_many(self, items: list, timeout: float | None = None, slice_size: int | None = None) -> list:
+        """이미 묶음이 있는 요청(일괄 분류)을 slice_size(기본 max_batch_size)씩 한 번의 forward로 추론.
+
+        조각은 큐를 거치며, 한 조각이 끝나야 다음 조각을 넣으므로 그 사이에 들어온 대화형 요청은
+        최대 한 조각의 forward만 기다린다.
+        """
+        n = max(1, int(slice_size or self.max_batch_size))
+        out = []
+        for i in range(0, len(items), n):
+            fut = self.submit(_Slice(items[i:i + n]), block=True, timeout=timeout)
+            out.extend(self._result(fut, timeout))
+        return out
+
+    def _collect(self) -> list[tuple[Any, Future]]:
+        try:
+            first = self._q.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._q.get(timeout=remaining) if remaining > 0 else self._q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _forward(self, xs: list) -> list:
+        with self._model_lock:
+            t0 = time.perf_counter()
+            results = self._predict_batch(xs)
+            if self.metrics is not None:
+                self.metrics.record("model_forward", time.perf_counter() - t0)
+        self.batches += 1
+        self.items += len(xs)
+        return results
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            batch = [(x, f) for x, f in self._collect() if f.set_running_or_notify_cancel()]
+            singles = [(x, f) for x, f in batch if not isinstance(x, _Slice)]
+            # (입력 목록, 결과를 받을 Future 목록 또는 조각 전체의 Future 하나)
+            groups = [([x for x, _ in singles], [f for _, f in singles])] if singles else []
+            groups += [(x.items, f) for x, f in batch if isinstance(x, _Slice)]
+            for xs, target in groups:
+                try:
+                    results = self._forward(xs)
+                except BaseException as e:
+                    for f in target if isinstance(target, list) else [target]:
+                        f.set_exception(e)
+                    continue
+                if isinstance(target, list):
+                    for f, r in zip(target, results):
+                        f.set_result(r)
+                else:
+                    target.set_result(results)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._worker.join(timeout=1.0)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._q.qsize(),
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": self.items / self.batches if self.batches else 0.0,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,186 @@
+# label_content.py
+# 라벨별 고정 콘텐츠: 매니페스트(TOML/JSON) 로드 → vocab 검증 → 이미지 썸네일 캐시 → 라벨별 HTML 조각 미리 생성
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+log = logging.getLogger(__name__)
+
+THUMB_MAX = 480                 # 썸네일 긴 변
+MAX_ASSET_BYTES = 10 * 2**20    # 원격 이미지 최대 크기
+FETCH_TIMEOUT = 10.0
+_USER_AGENT = "Mozilla/5.0 (label-content prefetch)"
+CONTENT_FIELDS = ("texts", "images", "videos")
+
+
+# ======================
+# 유튜브
+# ======================
+def yt_id_from_url(url: str) -> str | None:
+    if not url: return None
+    pats = [r"(?:v=|/)([0-9A-Za-z_-]{11})(?:\?|&|/|$)", r"youtu\.be/([0-9A-Za-z_-]{11})"]
+    for p in pats:
+        m = re.search(p, url)
+        if m: return m.group(1)
+    return None
+
+def yt_thumb(url: str) -> str | None:
+    vid = yt_id_from_url(url)
+    return f"https://img.youtube.com/vi/{vid}/hqdefault.jpg" if vid else None
+
+def pick_top3(lst):
+    return [x for x in lst if isinstance(x, str) and x.strip()][:3]
+
+
+# ======================
+# 매니페스트
+# ======================
+def load_manifest(path: str) -> dict:
+    with open(path, "rb") as f:
+        if path.endswith(".toml"):
+            try:
+                import tomllib
+            except ModuleNotFoundError:   # Python < 3.11
+                import tomli as tomllib
+            return tomllib.load(f)
+        return json.load(f)
+
+
+def resolve_labels(raw: dict, vocab: list[str]) -> tuple[dict[str, dict], list[str]]:
+    """매니페스트 키(라벨 이름 또는 "#인덱스")를 vocab 라벨로 맞추고, 문제점을 모아 반환."""
+    resolved, problems = {}, []
+    for key, cfg in raw.items():
+        if not isinstance(cfg, dict):
+            problems.append(f"`{key}`: 테이블이 아닙니다.")
+            continue
+        label = key
+        if key.startswith("#"):
+            try:
+                label = vocab[int(key[1:])]
+            except (ValueError, IndexError):
+                problems.append(f"`{key}`: vocab 인덱스 범위를 벗어났습니다 (라벨 {len(vocab)}개).")
+                continue
+        elif key not in vocab:
+            problems.append(f"`{key}`: 모델 vocab에 없는 라벨입니다.")
+            continue
+        if label in resolved:
+            problems.append(f"`{key}`: 라벨 `{label}`이 중복 정의되었습니다.")
+        unknown = set(cfg) - set(CONTENT_FIELDS)
+        if unknown:
+            problems.append(f"`{key}`: 알 수 없는 항목 {sorted(unknown)} (texts/images/videos만 사용).")
+        clean = {}
+        for field in CONTENT_FIELDS:
+            val = cfg.get(field, [])
+            if not isinstance(val, list):   # texts = "..." 처럼 쓰면 글자 하나씩 카드가 됨
+                problems.append(f"`{key}`.{field}: 문자열 목록이어야 합니다 ({type(val).__name__}).")
+                val = []
+            elif not all(isinstance(x, str) for x in val):
+                problems.append(f"`{key}`.{field}: 문자열이 아닌 항목은 무시합니다.")
+                val = [x for x in val if isinstance(x, str)]
+            clean[field] = val
+        resolved[label] = clean
+    return resolved, problems
+
+
+# ======================
+# 이미지 썸네일 캐시
+# ======================
+def _read_source(src: str, base_dir: str) -> bytes:
+    if src.startswith("data:"):
+        return base64.b64decode(src.split(",", 1)[1])
+    if src.startswith(("http://", "https://")):
+        req = urllib.request.Request(src, headers={"User-Agent": _USER_AGENT})
+        with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as r:
+            b = r.read(MAX_ASSET_BYTES + 1)
+        if len(b) > MAX_ASSET_BYTES:
+            raise ValueError("image too large")
+        return b
+    with open(os.path.join(base_dir, src), "rb") as f:
+        return f.read()
+
+
+def cache_thumbnail(src: str, base_dir: str, asset_dir: str, url_prefix: str,
+                    max_side: int = THUMB_MAX) -> str:
+    """이미지를 WebP 썸네일로 asset_dir에 저장하고 정적 URL 반환. 실패하면 원본 URL(로컬 파일은 None).
+
+    원본은 매번 읽는다 (매니페스트가 바뀌거나 프로세스가 시작될 때만 호출됨).
+    """
+    try:
+        data = _read_source(src, base_dir)
+        # 파일 이름과 ?v= 는 원본 바이트(+크기)의 해시: 같은 경로의 이미지를 바꾸면 URL도 바뀐다
+        h = hashlib.blake2b(data, digest_size=12)
+        h.update(f":{max_side}".encode())
+        name = h.hexdigest() + ".webp"
+        dest = os.path.join(asset_dir, name)
+        url = f"{url_prefix}/{name}?v={name[:8]}"
+        if os.path.exists(dest):
+            return url
+        with Image.open(BytesIO(data)) as im:
+            im = ImageOps.exif_transpose(im)
+            im = im.convert("RGBA" if "A" in im.getbands() else "RGB")
+            im.thumbnail((max_side, max_side))
+            os.makedirs(asset_dir, exist_ok=True)
+            tmp = dest + ".tmp"
+            im.save(tmp, "WEBP", quality=80, method=4)
+        os.replace(tmp, dest)
+        return url
+    except Exception as e:
+        log.warning("thumbnail failed for %.80s: %s", src, e)
+        return src if src.startswith(("http://", "https://")) else None
+
+
+# ======================
+# HTML 조각
+# ======================
+def _card(span: int, title: str, body: str) -> str:
+    return f'<div class="card" style="grid-column:span {span};"><h4>{title}</h4>{body}</div>'
+
+
+def render_label_html(texts, image_urls, videos) -> str:
+    """라벨 하나의 콘텐츠 패널 전체를 한 번의 st.markdown으로 그릴 HTML."""
+    cards = [_card(12, "텍스트", f"<div>{t}</div>") for t in texts]
+    cards += [_card(4, "이미지", f'<img src="{escape(u)}" class="thumb" loading="lazy"/>')
+              for u in image_urls if u]
+    for v, thumb in videos:
+        if thumb:
+            body = (f'<a href="{escape(v)}" target="_blank" class="thumb-wrap">'
+                    f'<img src="{escape(thumb)}" class="thumb" loading="lazy"/><div class="play"></div></a>'
+                    f'<div class="helper">{escape(v)}</div>')
+        else:
+            body = f'<a href="{escape(v)}" target="_blank">{escape(v)}</a>'
+        cards.append(_card(6, "동영상", body))
+    return f'<div class="info-grid">{"".join(cards)}</div>'
+
+
+def build_label_content(path: str, vocab: list[str], asset_dir: str, url_prefix: str,
+                        max_side: int = THUMB_MAX) -> tuple[dict[str, str], list[str]]:
+    """매니페스트 → {라벨: HTML 조각}, 문제점 목록. 원격 이미지는 병렬로 미리 받아둔다."""
+    resolved, problems = resolve_labels(load_manifest(path), vocab)
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    picked = {
+        label: (pick_top3(cfg.get("texts", [])), pick_top3(cfg.get("images", [])), pick_top3(cfg.get("videos", [])))
+        for label, cfg in resolved.items()
+    }
+    sources = {src for _, imgs, _ in picked.values() for src in imgs}
+    sources |= {t for _, _, vids in picked.values() for t in map(yt_thumb, vids) if t}
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        urls = dict(zip(sources, ex.map(
+            lambda s: cache_thumbnail(s, base_dir, asset_dir, url_prefix, max_side), sources)))
+
+    html = {}
+    for label, (texts, imgs, vids) in picked.items():
+        if not any([texts, imgs, vids]):
+            continue
+        videos = [(v, urls.get(yt_thumb(v))) for v in vids]
+        html[label] = render_label_html(texts, [urls[s] for s in imgs], videos)
+    return html, problems
@@ -0,0 +1,255 @@
+# live.py
+# 실시간(연속 프레임) 분류: 최신 프레임 한 칸 우편함 + 비동기 추론 루프
+# - 모델이 밀리면 처리 못 한 이전 프레임은 버린다 (dropped)
+# - 마지막으로 추론한 프레임과 거의 같은 프레임은 건너뛴다 (skipped)
+# - 확률은 최근 window개 추론 결과의 평균으로 부드럽게 한다
+# - 프레임이 idle_timeout 동안 없거나, latest()를 poll_timeout 동안 아무도 읽지 않으면(브라우저 탭 닫힘) 종료
+#
+# 오프라인 확인: python live.py --seconds 5 --fps 30 --forward-ms 60
+import argparse
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from inference_scheduler import SchedulerBusy
+from prediction_cache import Prediction
+
+
+class LiveResult(NamedTuple):
+    label: str | None
+    probs: np.ndarray | None       # 평활화된 확률
+    frame: np.ndarray | None       # 마지막으로 추론한 프레임
+    frames_in: int
+    inferred: int
+    dropped: int
+    skipped: int
+    fps_in: float
+    fps_inferred: float
+
+
+def frame_signature(frame: np.ndarray, grid: int = 32) -> np.ndarray:
+    """변화 감지용 저해상도 흑백 요약 (간격 샘플링이라 복사 비용이 거의 없음)."""
+    h, w = frame.shape[:2]
+    small = frame[:: max(h // grid, 1), :: max(w // grid, 1)]
+    return small.mean(axis=2, dtype=np.float32) if small.ndim == 3 else small.astype(np.float32)
+
+
+def _rate(times: deque) -> float:
+    if len(times) < 2 or times[-1] == times[0]:
+        return 0.0
+    return (len(times) - 1) / (times[-1] - times[0])
+
+
+class LiveClassifier:
+    """submit()으로 프레임을 넣고 latest()로 현재 결과를 읽는다. 추론은 별도 스레드에서."""
+
+    def __init__(
+        self,
+        predict: Callable[[np.ndarray], Prediction],
+        vocab: list[str],
+        window: int = 5,
+        change_threshold: float = 2.0,
+        idle_timeout: float = 30.0,
+        poll_timeout: float = 0.0,
+    ):
+        self._predict = predict
+        self.vocab = list(vocab)
+        self.change_threshold = change_threshold   # 0~255 평균 절대 차이, 0이면 건너뛰기 안 함
+        self.idle_timeout = idle_timeout
+        self.poll_timeout = poll_timeout           # 0이면 확인 안 함
+        self._last_poll = time.monotonic()
+        self._cond = threading.Condition()
+        self._slot: np.ndarray | None = None
+        self._window: deque = deque(maxlen=max(1, window))
+        self._in_times: deque = deque(maxlen=60)
+        self._inf_times: deque = deque(maxlen=30)
+        self._last_sig: np.ndarray | None = None
+        self._result = LiveResult(None, None, None, 0, 0, 0, 0, 0.0, 0.0)
+        self.frames_in = self.inferred = self.dropped = self.skipped = 0
+        self.error: BaseException | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="live-classifier", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def submit(self, frame: np.ndarray) -> None:
+        with self._cond:
+            if self._slot is not None:
+                self.dropped += 1   # 아직 추론 못 한 이전 프레임은 최신 것으로 덮어씀
+            self._slot = frame
+            self.frames_in += 1
+            self._in_times.append(time.monotonic())
+            self._cond.notify()
+
+    def _abandoned(self) -> bool:
+        return bool(self.poll_timeout) and time.monotonic() - self._last_poll > self.poll_timeout
+
+    def _take(self) -> np.ndarray | None:
+        with self._cond:
+            deadline = time.monotonic() + self.idle_timeout
+            while self._slot is None and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._abandoned():
+                    return None
+                self._cond.wait(timeout=min(remaining, 0.2))
+            frame, self._slot = self._slot, None
+            return frame
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            frame = self._take()
+            if frame is None or self._abandoned():
+                return   # 프레임이 끊겼거나 결과를 읽는 세션이 없으면 종료
+            sig = frame_signature(frame)
+            if (self._last_sig is not None and self.change_threshold > 0
+                    and float(np.abs(sig - self._last_sig).mean()) < self.change_threshold):
+                self.skipped += 1
+                self._publish(None, None)
+                continue
+            try:
+                pred = self._predict(frame)
+            except (SchedulerBusy, TimeoutError):   # 서버가 바쁨: 이 프레임은 버리고 다음 프레임으로
+                with self._cond:   # submit()과 같은 카운터
+                    self.dropped += 1
+                continue
+            except BaseException as e:
+                self.error = e
+                return
+            self._last_sig = sig
+            self._window.append(np.asarray(pred.probs, dtype=np.float32))
+            self.inferred += 1
+            self._inf_times.append(time.monotonic())
+            self._publish(np.mean(self._window, axis=0), frame)
+
+    def _publish(self, probs: np.ndarray | None, frame: np.ndarray | None) -> None:
+        prev = self._result
+        if probs is None:
+            probs, frame = prev.probs, prev.frame
+        label = self.vocab[int(probs.argmax())] if probs is not None else None
+        with self._cond:
+            fps_in = _rate(self._in_times)
+        self._result = LiveResult(label, probs, frame, self.frames_in, self.inferred, self.dropped,
+                                  self.skipped, fps_in, _rate(self._inf_times))
+
+    def latest(self) -> LiveResult:
+        self._last_poll = time.monotonic()
+        r = self._result
+        # 처리 중에도 입력 카운터는 최신 값으로
+        return r._replace(frames_in=self.frames_in, dropped=self.dropped, skipped=self.skipped)
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+
+
+# ======================
+# 프레임 소스
+# ======================
+def synthetic_frames(n: int, size=(360, 480), scene_every: int = 45, seed: int = 0) -> Iterator[np.ndarray]:
+    """장면이 scene_every 프레임마다 바뀌고, 그 사이엔 약한 노이즈만 있는 합성 영상."""
+    rng = np.random.default_rng(seed)
+    h, w = size
+    base = None
+    for i in range(n):
+        if i % scene_every == 0:
+            base = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        noise = rng.integers(-2, 3, (h, w, 3), dtype=np.int16)
+        yield np.clip(base.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def video_frames(path: str, max_side: int = 640) -> Iterator[np.ndarray]:
+    """OpenCV로 동영상을 읽어 RGB 프레임(긴 변 <= max_side)을 흘려보냄."""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    try:
+        while True:
+            ok, bgr = cap.read()
+            if not ok:
+                return
+            h, w = bgr.shape[:2]
+            if max(h, w) > max_side:
+                s = max_side / max(h, w)
+                bgr = cv2.resize(bgr, (round(w * s), round(h * s)), interpolation=cv2.INTER_AREA)
+            yield cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    finally:
+        cap.release()
+
+
+def video_fps(path: str, default: float = 30.0) -> float:
+    import cv2
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    cap.release()
+    return fps if fps and fps > 0 else default
+
+
+def play(frames: Iterable[np.ndarray], fps: float, clf: LiveClassifier,
+         stop: threading.Event | None = None) -> None:
+    """프레임을 실제 재생 속도(fps)로 분류기에 넣음. 분류기가 느리면 분류기 쪽에서 프레임을 버린다.
+
+    분류기가 멈추면(정지/시간 초과) 재생도 끝낸다.
+    """
+    t0 = time.monotonic()
+    for i, frame in enumerate(frames):
+        if (stop is not None and stop.is_set()) or not clf.running:
+            return
+        delay = t0 + i / fps - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        clf.submit(frame)
+
+
+def play_video_bytes(data: bytes, suffix: str, clf: LiveClassifier, stop: threading.Event,
+                     max_side: int = 640) -> threading.Thread:
+    """업로드된 동영상을 임시 파일로 저장하고 백그라운드 스레드에서 재생."""
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+    def run():
+        try:
+            play(video_frames(path, max_side), video_fps(path), clf, stop)
+        finally:
+            os.remove(path)
+
+    t = threading.Thread(target=run, name="live-video", daemon=True)
+    t.start()
+    return t
+
+
+def main(argv=None) -> None:
+    from benchmark import StubBackend
+    from PIL import Image
+
+    ap = argparse.ArgumentParser(description="실시간 분류 루프 오프라인 확인 (합성 프레임 + 스텁 모델)")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--fps", type=float, default=30.0)
+    ap.add_argument("--forward-ms", type=float, default=60.0)
+    ap.add_argument("--window", type=int, default=5)
+    ap.add_argument("--change-threshold", type=float, default=2.0)
+    args = ap.parse_args(argv)
+
+    backend = StubBackend(forward_ms=args.forward_ms)
+    clf = LiveClassifier(lambda f: backend.predict_batch([backend.prepare(Image.fromarray(f))])[0],
+                         backend.vocab, window=args.window, change_threshold=args.change_threshold)
+    t0 = time.monotonic()
+    play(synthetic_frames(int(args.seconds * args.fps)), args.fps, clf)
+    time.sleep(args.forward_ms / 1000 * 2)
+    clf.stop()
+    r = clf.latest()
+    elapsed = time.monotonic() - t0
+    print(f"입력 {r.frames_in}프레임 ({r.frames_in / elapsed:.1f} fps) · 추론 {r.inferred} "
+          f"({r.inferred / elapsed:.1f} fps) · 버림 {r.dropped} · 변화 없음 건너뜀 {r.skipped} · 라벨 {r.label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# model_store.py
+# 모델 파일 가져오기: 임시 파일(.part)로 이어받기 → 크기/sha256 검증 → 원자적 rename
+# 버전별 디렉터리(models/<version>/model.pkl)에 보관하고, 다운로드 소스는 교체 가능
+# (gdrive:<id> / http(s)://... / file://... 또는 로컬 경로 — 오프라인 테스트용)
+import hashlib
+import logging
+import os
+import re
+import shutil
+import time
+import urllib.error
+import urllib.request
+from typing import NamedTuple
+
+log = logging.getLogger(__name__)
+
+_CHUNK = 1 << 20
+TORCH_ZIP_MAGIC = b"PK\x03\x04"   # fastai export() = torch.save → zip 아카이브
+
+
+class ModelIntegrityError(RuntimeError):
+    """받은 모델 파일의 크기나 체크섬이 기대값과 다를 때."""
+
+
+class LocalModel(NamedTuple):
+    path: str
+    version: str
+    sha256: str
+
+
+def _resume_offset(dest: str) -> int:
+    return os.path.getsize(dest) if os.path.exists(dest) else 0
+
+
+class GDriveSource:
+    def __init__(self, file_id: str):
+        self.file_id = file_id
+
+    def fetch(self, dest: str) -> None:
+        import gdown   # 필요할 때만 import
+        url = f"https://drive.google.com/uc?id={self.file_id}"
+        # gdown은 자체 임시 파일로 이어받고, 끝까지 받은 뒤에만 dest를 만든다
+        if gdown.download(url, dest, quiet=False, resume=True) is None:
+            raise OSError(f"gdown download failed: {url}")
+
+    def __repr__(self):
+        return f"gdrive:{self.file_id}"
+
+
+class HTTPSource:
+    def __init__(self, url: str, timeout: float = 30.0):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self, dest: str) -> None:
+        offset = _resume_offset(dest)
+        req = urllib.request.Request(self.url, headers={"Range": f"bytes={offset}-"} if offset else {})
+        try:
+            r = urllib.request.urlopen(req, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 416:   # 이미 끝까지 받은 상태
+                return
+            raise
+        with r, open(dest, "ab" if offset and r.status == 206 else "wb") as f:
+            shutil.copyfileobj(r, f, _CHUNK)
+
+    def __repr__(self):
+        return self.url
+
+
+class LocalFileSource:
+    """로컬 파일을 다운로드처럼 복사 (오프라인 테스트/사내 미러용). 이어받기도 동일하게 동작."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self, dest: str) -> None:
+        offset = _resume_offset(dest)
+        if offset > os.path.getsize(self.path):
+            offset = 0
+        with open(self.path, "rb") as src, open(dest, "ab" if offset else "wb") as f:
+            src.seek(offset)
+            shutil.copyfileobj(src, f, _CHUNK)
+
+    def __repr__(self):
+        return f"file://{self.path}"
+
+
+def make_source(spec: str):
+    """'gdrive:<id>' | 'http(s)://...' | 'file://<path>' | '<path>' → 소스 객체."""
+    if spec.startswith("gdrive:"):
+        return GDriveSource(spec[len("gdrive:"):])
+    if spec.startswith(("http://", "https://")):
+        return HTTPSource(spec)
+    if spec.startswith("file://"):
+        return LocalFileSource(spec[len("file://"):])
+    return LocalFileSource(spec)
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _write_atomic(path: str, text: str) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class ModelStore:
+    """버전별 로컬 모델 캐시. 검증을 통과한 파일만 최종 경로에 나타난다."""
+
+    def __init__(self, root: str = "models", keep: int = 2):
+        self.root = root
+        self.keep = keep
+
+    def version_dir(self, version: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^0-9A-Za-z._-]", "_", version))
+
+    def fetch(self, source, version: str, filename: str = "model.pkl",
+              sha256: str | None = None, size: int | None = None, retries: int = 2,
+              magic: bytes | None = TORCH_ZIP_MAGIC) -> LocalModel:
+        """filename은 버전 디렉터리 기준 상대 경로 (하위 디렉터리 허용, 절대 경로/.. 불가).
+
+        sha256도 size도 없으면 최소한 파일 앞부분이 magic인지 확인한다 (HTML 오류 페이지 등을 거름).
+        """
+        parts = filename.replace("\\", "/").split("/")
+        if os.path.isabs(filename) or ".." in parts or not parts[-1]:
+            raise ValueError(f"model filename must be a relative path inside the version directory: {filename!r}")
+        d = self.version_dir(version)
+        path = os.path.join(d, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        marker = path + ".sha256"
+        sha256 = sha256.lower() if sha256 else None
+
+        if os.path.exists(path):
+            digest = self._verified_digest(path, marker)
+            if digest is not None and self._matches(path, digest, sha256, size, magic):
+                return LocalModel(path, version, digest)
+            os.remove(path)   # 손상됐거나 기대값과 다른 파일은 버리고 다시 받음
+
+        part = path + ".part"
+        for attempt in range(retries + 1):
+            try:
+                source.fetch(part)
+                break
+            except OSError:
+                if attempt == retries:
+                    raise
+                time.sleep(2 ** attempt)   # .part를 남겨 두고 이어받기
+
+        if sha256 is None and size is None:
+            log.warning("%r: MODEL_SHA256/MODEL_SIZE가 지정되지 않아 파일 형식만 확인합니다.", source)
+        digest = sha256_file(part)
+        if not self._matches(part, digest, sha256, size, magic):
+            got = os.path.getsize(part)
+            os.remove(part)
+            raise ModelIntegrityError(
+                f"{source!r}: size={got} sha256={digest} (expected size={size} sha256={sha256}"
+                + (f" or a file starting with {magic!r})" if sha256 is None and size is None else ")"))
+        os.replace(part, path)
+        _write_atomic(marker, digest)
+        self.prune(current=d)
+        return LocalModel(path, version, digest)
+
+    @staticmethod
+    def _verified_digest(path: str, marker: str) -> str | None:
+        """marker가 파일보다 새로우면 기록된 값을 쓰고, 없거나 오래됐으면 다시 해시.
+
+        다시 해시한 값이 기록과 다르면 (받은 뒤 파일이 바뀜) None.
+        """
+        recorded = None
+        if os.path.exists(marker):
+            with open(marker) as f:
+                recorded = f.read().strip()
+            if os.path.getmtime(marker) >= os.path.getmtime(path):
+                return recorded
+        digest = sha256_file(path)
+        if recorded is not None and digest != recorded:
+            return None
+        _write_atomic(marker, digest)
+        return digest
+
+    @staticmethod
+    def _matches(path: str, digest: str, sha256: str | None, size: int | None,
+                 magic: bytes | None = None) -> bool:
+        if sha256 is None and size is None:
+            if not magic:
+                return True
+            with open(path, "rb") as f:
+                return f.read(len(magic)) == magic
+        return (sha256 is None or digest == sha256) and (size is None or os.path.getsize(path) == int(size))
+
+    def latest(self, filename: str = "model.pkl") -> str | None:
+        """filename이 있는 가장 최근 버전의 경로 (export_model.py 기본값). 없으면 None."""
+        if not os.path.isdir(self.root):
+            return None
+        paths = [os.path.join(self.root, x, filename) for x in os.listdir(self.root)]
+        paths = [p for p in paths if os.path.isfile(p)]
+        return max(paths, key=os.path.getmtime) if paths else None
+
+    def prune(self, current: str) -> None:
+        """최근 버전 keep개만 남기고 삭제."""
+        if not os.path.isdir(self.root):
+            return
+        dirs = [os.path.join(self.root, x) for x in os.listdir(self.root)]
+        dirs = sorted((x for x in dirs if os.path.isdir(x) and x != current), key=os.path.getmtime, reverse=True)
+        for old in dirs[max(self.keep - 1, 0):]:
+            shutil.rmtree(old, ignore_errors=True)
@@ -0,0 +1,91 @@
+# prediction_cache.py
+# 세션 간 공유되는 예측 결과 캐시 (이미지 바이트 해시 + 모델 식별자 기준)
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+
+class Prediction(NamedTuple):
+    label: str
+    idx: int
+    probs: np.ndarray
+
+
+def image_digest(img_bytes: bytes) -> str:
+    return hashlib.blake2b(img_bytes, digest_size=16).hexdigest()
+
+
+def prediction_key(digest: str, model_id: str) -> str:
+    """이미지 내용 해시(image_digest)와 모델 식별자로 캐시 키 생성."""
+    return f"{model_id}:{digest}"
+
+
+class PredictionCache:
+    """LRU + TTL 예측 캐시. 여러 세션(스레드)에서 동시에 사용해도 안전."""
+
+    def __init__(self, maxsize: int = 512, ttl: float | None = 3600.0):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._data: OrderedDict[str, tuple[float, Prediction]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Prediction | None:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, pred = item
+            if expires_at < now:
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return pred
+
+    def put(self, key: str, pred: Prediction) -> Prediction:
+        # 여러 세션이 같은 배열을 공유하므로 읽기 전용으로 고정
+        probs = np.array(pred.probs, dtype=np.float32)
+        probs.setflags(write=False)
+        pred = Prediction(str(pred.label), int(pred.idx), probs)
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._data[key] = (expires_at, pred)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return pred
+
+    def get_or_compute(self, key: str, compute: Callable[[], Prediction]) -> Prediction:
+        """캐시에 있으면 반환, 없으면 compute() 실행 후 저장. 추론은 락 밖에서 수행."""
+        pred = self.get(key)
+        if pred is None:
+            pred = self.put(key, compute())
+        return pred
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,72 @@
+# preprocess.py
+# 업로드 이미지 전처리: 디코딩 단계에서 축소(JPEG draft) → EXIF 회전/RGB 변환 1회 → 작업용 이미지 + 미리보기
+from io import BytesIO
+from typing import NamedTuple
+
+from PIL import Image, ImageOps
+
+from timing import Trace, stage_of
+
+MAX_UPLOAD_BYTES = 25 * 2**20      # 업로드 1건 최대 바이트
+MAX_IMAGE_PIXELS = 40_000_000      # 헤더 기준 최대 픽셀 수 (디컴프레션 폭탄 방지)
+PREVIEW_MAX = 512                  # 미리보기 긴 변
+
+
+class ImageTooLarge(ValueError):
+    """바이트 수 또는 픽셀 수가 한도를 넘는 이미지."""
+
+
+class DecodedImage(NamedTuple):
+    work: Image.Image             # 모델 입력용 (짧은 변 >= min_side, RGB, 회전 적용됨)
+    preview: Image.Image | None   # st.image 표시용 (긴 변 <= preview_max)
+
+
+def decode_image(
+    b: bytes,
+    min_side: int | None = None,
+    preview_max: int = 0,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    max_pixels: int = MAX_IMAGE_PIXELS,
+    trace: Trace | None = None,
+) -> DecodedImage:
+    """바이트 → 작업용 이미지(+미리보기). 원본 해상도 전체를 여러 번 복사하지 않는다.
+
+    min_side: 작업용 이미지의 짧은 변 하한. None이면 원본 크기를 유지한다.
+    JPEG은 draft()로 1/2, 1/4, 1/8 축소 디코딩하므로 12MP 사진도 작은 크기로만 풀린다.
+    trace를 주면 decode / exif_transpose / resize / preview 단계 시간을 기록한다.
+    """
+    if len(b) > max_bytes:
+        raise ImageTooLarge(f"파일이 너무 큽니다 ({len(b) / 2**20:.1f} MB > {max_bytes / 2**20:.0f} MB)")
+    with stage_of(trace, "decode"):
+        try:
+            src = Image.open(BytesIO(b))
+        except Image.DecompressionBombError as e:
+            raise ImageTooLarge(str(e)) from e
+        w, h = src.size
+        if w * h > max_pixels:
+            src.close()
+            raise ImageTooLarge(f"이미지 해상도가 너무 큽니다 ({w}x{h})")
+        target = max(min_side, preview_max) if min_side else 0
+        if target and src.format == "JPEG":
+            src.draft("RGB", (target, target))   # 두 변 모두 target 이상이 되는 가장 작은 배율
+        src.load()
+
+    with src:
+        with stage_of(trace, "exif_transpose"):
+            ImageOps.exif_transpose(src, in_place=True)
+        with stage_of(trace, "resize"):
+            img = src.convert("RGB") if src.mode != "RGB" else src
+            # draft가 안 되는 포맷(PNG 등)이나 남은 배율은 여기서 줄임
+            if target and min(img.size) > target:
+                scale = target / min(img.size)
+                img = img.resize((round(img.width * scale), round(img.height * scale)),
+                                 Image.BILINEAR, reducing_gap=2.0)
+            if img is src:
+                img = src.copy()   # 원본 바이트(파일 핸들)와의 연결을 끊음
+
+    preview = None
+    if preview_max:
+        with stage_of(trace, "preview"):
+            preview = img.copy()
+            preview.thumbnail((preview_max, preview_max))
+    return DecodedImage(img, preview)
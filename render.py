@@ -0,0 +1,42 @@
+# render.py
+# 결과 패널 HTML (앱과 benchmark.py가 같은 코드를 사용)
+import numpy as np
+
+
+def sort_probs(labels: list[str], probs) -> list[tuple[str, float]]:
+    """(라벨, 확률)을 확률 내림차순으로."""
+    return sorted(((labels[i], float(probs[i])) for i in range(len(labels))),
+                  key=lambda x: x[1], reverse=True)
+
+
+def prob_card_html(label: str, p: float, highlight: bool = False) -> str:
+    pct = p * 100
+    hi = "highlight" if highlight else ""
+    return f"""
+                <div class="prob-card">
+                  <div style="display:flex;justify-content:space-between;margin-bottom:6px;">
+                    <strong>{label}</strong><span>{pct:.2f}%</span>
+                  </div>
+                  <div class="prob-bar-bg">
+                    <div class="prob-bar-fg {hi}" style="width:{pct:.4f}%;"></div>
+                  </div>
+                </div>
+                """
+
+
+def top_probs(labels: list[str], probs, k: int | None = None) -> list[tuple[str, float]]:
+    """확률 상위 k개만 내림차순으로 (라벨이 많을 때 전체 정렬 대신 argpartition)."""
+    p = np.asarray(probs, dtype=np.float32)
+    if not k or k >= len(p):
+        return sort_probs(labels, p)
+    idx = np.argpartition(-p, k - 1)[:k]
+    idx = idx[np.argsort(-p[idx], kind="stable")]
+    return [(labels[i], float(p[i])) for i in idx]
+
+
+def prob_panel_html(prob_list: list[tuple[str, float]], highlight: str | None = None, hidden: int = 0) -> str:
+    """확률 카드 목록 전체를 한 번의 st.markdown으로 그리기 위한 HTML 한 덩어리."""
+    html = "".join(prob_card_html(lbl, p, lbl == highlight) for lbl, p in prob_list)
+    if hidden:
+        html += f'<div class="helper">외 {hidden}개 라벨 (확률 낮음)</div>'
+    return html
@@ -1,11 +1,27 @@
 # streamlit_app.py
-import os, re
-from io import BytesIO
-import numpy as np
+import time
+_script_t0 = time.perf_counter()
+import logging
+import os
+import threading
+import pandas as pd
 import streamlit as st
-from PIL import Image, ImageOps
-from fastai.vision.all import *
-import gdown
+from PIL import Image
+from backends import available_backends, load_backend
+from batch_predict import count_upload_images, iter_upload_bytes, predict_batches, rows_to_records
+from inference_scheduler import InferenceScheduler, SchedulerBusy, configure_torch_threads
+from label_content import build_label_content
+from live import LiveClassifier, play_video_bytes
+from model_store import ModelStore, make_source
+from prediction_cache import Prediction, PredictionCache, image_digest, prediction_key
+from preprocess import ImageTooLarge, decode_image
+from render import prob_panel_html, top_probs
+from timing import PhaseTimer, StageMetrics, Trace
+try:   # 선택: 웹캠 실시간 분류 (pip install streamlit-webrtc)
+    from streamlit_webrtc import webrtc_streamer
+except ImportError:
+    webrtc_streamer = None
+# fastai/torch는 무거우므로 모델이 실제로 필요할 때(load_model) import 한다
 
 # ======================
 # 페이지/스타일
@@ -37,86 +53,282 @@ st.title("이미지 분류기 (Fastai) — 확률 막대 + 라벨별 고정 콘
 # ======================
 # 세션 상태
 # ======================
-if "img_bytes" not in st.session_state:
-    st.session_state.img_bytes = None
+# 원본 바이트 대신 내용 해시 + 축소된 작업용 이미지/미리보기만 보관
+for _k in ("img_key", "img_work", "img_preview"):
+    if _k not in st.session_state:
+        st.session_state[_k] = None
 if "last_prediction" not in st.session_state:
     st.session_state.last_prediction = None
+if "batch_records" not in st.session_state:
+    st.session_state.batch_records = None
+if "prob_html" not in st.session_state:
+    st.session_state.prob_html = {}   # {"key": 예측 키, top_k: 확률 패널 HTML}
+if "live" not in st.session_state:
+    st.session_state.live = None   # (LiveClassifier, 정지 이벤트)
 
 # ======================
 # 모델 로드
 # ======================
 FILE_ID = st.secrets.get("GDRIVE_FILE_ID", "1YuLCetTh_egOtS9mxzEzwGdazEYMn3Dm")
+# MODEL_CACHE_DIR/<version>/ 기준 상대 경로 (하위 디렉터리 허용). 절대 경로나 ..는 거부됨.
+# export_model.py의 TorchScript 아티팩트도 이 파일 옆에 있어야 사이드바에 나타난다.
 MODEL_PATH = st.secrets.get("MODEL_PATH", "model.pkl")
+# 다운로드 소스: gdrive:<id> | http(s)://... | file://<경로> (오프라인 테스트용)
+MODEL_SOURCE = st.secrets.get("MODEL_SOURCE", f"gdrive:{FILE_ID}")
+MODEL_VERSION = st.secrets.get("MODEL_VERSION", FILE_ID)
+MODEL_SHA256 = st.secrets.get("MODEL_SHA256")       # 지정하면 다운로드 후 검증
+MODEL_SIZE = st.secrets.get("MODEL_SIZE")           # 바이트 단위, 지정하면 검증 (둘 다 없으면 torch zip 형식만 확인)
+MODEL_CACHE_DIR = st.secrets.get("MODEL_CACHE_DIR", "models")
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTENT_MANIFEST = st.secrets.get("CONTENT_MANIFEST", os.path.join(APP_DIR, "content", "labels.toml"))
+# 썸네일은 static/ 아래에 저장 → Streamlit 정적 파일 서빙(.streamlit/config.toml)으로 제공
+ASSET_DIR = os.path.join(APP_DIR, "static", "assets")
+ASSET_URL = "app/static/assets"
+PRED_CACHE_SIZE = int(st.secrets.get("PRED_CACHE_SIZE", 512))
+PRED_CACHE_TTL = float(st.secrets.get("PRED_CACHE_TTL", 3600))
+BATCH_SIZE = int(st.secrets.get("BATCH_SIZE", 32))
+# 일괄 분류 한 번의 forward 상한: 그동안 다른 세션의 요청은 이 한 조각만큼 기다린다
+BATCH_MAX_FORWARD = int(st.secrets.get("BATCH_MAX_FORWARD", 64))
+PREVIEW_MAX = int(st.secrets.get("PREVIEW_MAX", 512))
+# 추론 백엔드: learner | torchscript | torchscript-int8 (export_model.py로 아티팩트 생성)
+INFER_BACKEND = st.secrets.get("INFER_BACKEND", "learner")
+# 마이크로 배칭 스케줄러 (모든 세션이 공유)
+SCHED_MAX_BATCH = int(st.secrets.get("SCHED_MAX_BATCH", 16))
+SCHED_MAX_WAIT_MS = float(st.secrets.get("SCHED_MAX_WAIT_MS", 5))
+SCHED_MAX_QUEUE = int(st.secrets.get("SCHED_MAX_QUEUE", 256))
+SCHED_TIMEOUT_S = float(st.secrets.get("SCHED_TIMEOUT_S", 30))
+TORCH_THREADS = int(st.secrets.get("TORCH_THREADS", os.cpu_count() or 1))
+TORCH_INTEROP_THREADS = int(st.secrets.get("TORCH_INTEROP_THREADS", 1))
+# 실시간 분류
+LIVE_WINDOW = int(st.secrets.get("LIVE_WINDOW", 5))                        # 확률 평활화 창(추론 횟수)
+LIVE_CHANGE_THRESHOLD = float(st.secrets.get("LIVE_CHANGE_THRESHOLD", 2.0))  # 이보다 변화가 작으면 추론 생략
+LIVE_REFRESH_S = float(st.secrets.get("LIVE_REFRESH_S", 0.5))             # 결과 패널만 갱신하는 주기
+# 결과 패널이 이 시간 동안 갱신되지 않으면(탭 닫힘) 분류기와 동영상 재생을 멈춤
+LIVE_POLL_TIMEOUT = float(st.secrets.get("LIVE_POLL_TIMEOUT", 10))
+# 확률 패널: 상위 k개만 표시 (0이면 전체). 라벨이 많을 때 렌더링 비용을 줄임
+PROB_TOP_K = int(st.secrets.get("PROB_TOP_K", 10))
+# 단계별 지연시간 지표
+METRICS_WINDOW = int(st.secrets.get("METRICS_WINDOW", 1000))   # 백분위 계산에 쓰는 최근 측정 수
+METRICS_LOG = bool(st.secrets.get("METRICS_LOG", False))      # 요청마다 JSON 한 줄 로그 출력
 
 @st.cache_resource
-def load_model_from_drive(file_id: str, output_path: str):
-    if not os.path.exists(output_path):
-        url = f"https://drive.google.com/uc?id={file_id}"
-        gdown.download(url, output_path, quiet=False)
-    return load_learner(output_path, cpu=True)
+def get_startup_timer() -> PhaseTimer:
+    """프로세스 시작 시 단계별 소요 시간 (다운로드/import/로드/워밍업)."""
+    return PhaseTimer()
+
+startup = get_startup_timer()
+
+@st.cache_resource
+def load_model(source: str, version: str, filename: str, sha256: str | None, size: int | None):
+    with startup.phase("download"):
+        local = ModelStore(MODEL_CACHE_DIR).fetch(make_source(source), version, filename,
+                                                  sha256=sha256, size=size)
+    with startup.phase("import"):
+        from fastai.vision.all import load_learner
+    with startup.phase("load_learner"):
+        learner = load_learner(local.path, cpu=True)
+    return learner, local
 
 with st.spinner("🤖 모델 로드 중..."):
-    learner = load_model_from_drive(FILE_ID, MODEL_PATH)
+    learner, local_model = load_model(MODEL_SOURCE, MODEL_VERSION, MODEL_PATH, MODEL_SHA256,
+                                      int(MODEL_SIZE) if MODEL_SIZE else None)
 st.success("✅ 모델 로드 완료")
+MODEL_ID = f"{local_model.version}:{local_model.sha256[:16]}"   # 예측 캐시 키에 포함되는 모델 식별자
+
+@st.cache_resource
+def get_prediction_cache(maxsize: int, ttl: float) -> PredictionCache:
+    """모든 세션이 공유하는 예측 캐시."""
+    return PredictionCache(maxsize=maxsize, ttl=ttl)
+
+pred_cache = get_prediction_cache(PRED_CACHE_SIZE, PRED_CACHE_TTL)
+
+@st.cache_resource
+def get_stage_metrics(window: int, log_json: bool) -> StageMetrics:
+    """모든 세션이 공유하는 단계별 지연시간 분포."""
+    if log_json:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        mlog = logging.getLogger("metrics")
+        mlog.addHandler(handler)
+        mlog.setLevel(logging.INFO)
+        mlog.propagate = False
+    return StageMetrics(window=window)
+
+stage_metrics = get_stage_metrics(METRICS_WINDOW, METRICS_LOG)
+trace = Trace(stage_metrics)   # 이번 실행(rerun)의 단계별 시간
+
+@st.cache_resource
+def get_backend(name: str, _learner, model_path: str):
+    with startup.phase(f"backend:{name}"):
+        return load_backend(name, _learner, model_path, metrics=stage_metrics)
+
+@st.cache_resource
+def get_model_lock():
+    """모든 백엔드의 스케줄러가 공유: forward는 프로세스 전체에서 한 번에 하나만 (TORCH_THREADS를 나눠 쓰지 않도록)."""
+    return threading.Lock()
+
+@st.cache_resource
+def get_scheduler(_backend, backend_id: str) -> InferenceScheduler:
+    """공유 백엔드(learner 포함)는 이 스케줄러의 워커 스레드만 호출한다."""
+    configure_torch_threads(TORCH_THREADS, TORCH_INTEROP_THREADS)
+    sched = InferenceScheduler(
+        _backend.predict_batch,
+        max_batch_size=SCHED_MAX_BATCH, max_wait_ms=SCHED_MAX_WAIT_MS, max_queue=SCHED_MAX_QUEUE,
+        metrics=stage_metrics, model_lock=get_model_lock(),
+    )
+    # 워밍업: 첫 사용자가 JIT/메모리 할당 비용을 치르지 않도록 더미 이미지로 한 번 추론
+    side = max(_backend.input_size) if _backend.input_size else 224
+    with startup.phase(f"warmup:{_backend.name}"):
+        sched.predict(_backend.prepare(Image.new("RGB", (side, side))), timeout=SCHED_TIMEOUT_S)
+    return sched
+
+backend_options = available_backends(local_model.path)
+backend_name = st.sidebar.selectbox(
+    "추론 백엔드", backend_options,
+    index=backend_options.index(INFER_BACKEND) if INFER_BACKEND in backend_options else 0,
+)
+backend = get_backend(backend_name, learner, local_model.path)
+BACKEND_ID = f"{MODEL_ID}:{backend_name}"   # 백엔드마다 확률이 조금씩 다르므로 캐시도 분리
+scheduler = get_scheduler(backend, BACKEND_ID)
+# 디코딩 단계에서 이 크기(모델 입력의 짧은 변)까지만 풀어냄
+MODEL_MIN_SIDE = min(backend.input_size) if backend.input_size else None
 
 labels = [str(x) for x in learner.dls.vocab]
 st.write(f"**분류 가능한 항목:** `{', '.join(labels)}`")
 st.markdown("---")
 
 # ======================
-# 라벨 이름 매핑: 여기를 채우세요!
-# 각 라벨당 최대 3개씩 표시됩니다.
+# 라벨별 고정 콘텐츠: content/labels.toml 에서 관리 (수정하면 자동으로 다시 읽음)
 # ======================
-CONTENT_BY_LABEL: dict[str, dict[str, list[str]]] = {
-    # 예)
-    # "짬뽕": {
-    #   "texts": ["짬뽕의 특징과 유래", "국물 맛 포인트", "지역별 스타일 차이"],
-    #   "images": ["https://.../jjampong1.jpg", "https://.../jjampong2.jpg"],
-    #   "videos": ["https://youtu.be/XXXXXXXXXXX"]
-    # },
-    labels[0] : {"texts" : ["중국식 냉면은 맛있어"], "image" : ["https://www.esquirekorea.co.kr/resources_old/online/org_online_image/eq/71c93efd-352d-4fb4-8a98-dd1b51475442.jpg"]},
-    labels[1] : {"texts" : ["짜장면은 맛있어"], "image" : ["https://i.namu.wiki/i/j2AxLP9AtrcJebh4DVfGxowfXwI3a95dG_YZb_Ktczc6Ca7ACyd_NJL3YHQMw8SABGTQiJDwSpySOSSBLZVEZw.webp"]},
-    labels[2] : {"texts" : ["짬뽕은 맛있어"], "image" : ["https://blog.kakaocdn.net/dna/YPxRW/btrzhpNljHH/AAAAAAAAAAAAAAAAAAAAAAhVpctCZeeRfUJSzJ9VBLKsQHsA38Gk5_KTV934P7vk/img.jpg?credential=yqXZFxpELC7KVnFOS48ylbz2pIh7yKj8&expires=1764514799&allow_ip=&allow_referer=&signature=KtGzPuSD0MLN59%2BpAsKcHnaNZ0U%3D"]},
-    labels[3] : {"texts" : ["탕수육은 맛있어"], "image" : ["data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wCEAAkGBxMTEhUTExMWFhUXGBcaFxgYFx8fGBoaGxsXGBofHhoYHyggGxslHRgYIjEiJSkrLi4uFx8zODMtNygtLisBCgoKDg0OGxAQGy0mICYuLS0tLy0vLS0tLS0tLS0tLS0tLS0tLS8tLS0tLS0tLS0tLS0tLS0tLS0tLS0tLS0tLf/AABEIAMIBAwMBIgACEQEDEQH/xAAbAAACAgMBAAAAAAAAAAAAAAAEBQMGAAIHAf/EAEoQAAECBAMFBQMHCgQFBQEAAAECAwAEESEFEjEGIkFRYRMycYGRI0KhBxQzUrHB0UNTYnKCkqLh8PEVJGOyFjSDk9IlNXOU4hf/xAAaAQACAwEBAAAAAAAAAAAAAAABAwACBAUG/8QAKhEAAgIBBAEEAgICAwAAAAAAAAECEQMEEiExQRMiUWEygXGRI6EFFEL/2gAMAwEAAhEDEQA/AOjGIXjQGJTCfaDFksIvdZ7qfvPSNd0jGUnaJWd0g6CA2gEigEOZHAn3z2i9xKjWqhdX6qRcxYJDCWWzRtsuuDUqoaePuI88xhD5GorMlgzzu8lFE/WVZPqdfKGKsCbZAW45mWLhIFB4mtz6Q8VM5lZcynXB+TYrQfrOnQeGWAsWzoBQvsmq37FtOdauIzq1imT8HQzH+Ss0ZmlG9ddPG3PxgqUmVLoAMyibCtPLMdITqmF5arsmtQjlal+WggB2fUe6KHS/COEltkpO+DtempppUXB+qbLcZbPJILq/VVh6QKmcIstdf65CA5eeccayDvgcaCo0vzgV3BnVKKi4kE+JjTm1Usi9vAnDpFFvcHvP00No8Lpoa1NecRNYOR3nCegg1DCUgVFac4y7nfJp9NeDaTmVGmZSiBwzEfEGJ5F8rdIAsdKqJpTmSYXvTqa00/CIpeaFSaVsbA08Iv6zb2N8C54IpN1yMcVaWojKsAcoUz8y42hKACSSalN9PCJXp9RHLnWFy3nKZrwueSnwg48b8g808HqppoNOIMJktLDhAqUp11oIfOzWprdWsEl5WQjmPgbRX1KQ2miLCpdvPmUa0FwfuiafxPI42L5VVNz1hG9KOouVZh9nlBDM8HFIqBRIoOdIkr/QNvNjuaztjOpJCDoekLFrLiV5lkJVoKJUmngoVB8IvGGzaXW8pANqEHSkLcS2cTQqaFqHd5eEWxS28xESlGftmjn0xhqT7qVAe8jdV6GxjR7Z9ejZCjSuStHKfq8fEQxZlSc+YKoKiwrve6L9YfsYX2jaUrbQ8UgVSCUTDZ6V71I6Omk5OvAjVYoY42nyc3dYKTRSSCOBEQOsiL8/KlRKAe2pqzMDK+n9VfvfGEczgqVkpaUUOcWXbK/ZVor7Y1OJiUytBuPckGPSikEpWkpUOBiPLFS4EpF42yXiZxF43KLxZFWRNN3g5lr7YjbReDW0QSpMlEZGAxkEB1yceUAQgAqpW5olI5qUdBCRuXbbcCl1fmF6btT+w2e6kfWX6cYKcdW9UNlKEIut0/Rtka0r9IsfWOnCmkBN4kkJV83SvIbKmFd5xXGh5DpztDcmSlbF48e50gyenUtmjyiXFfkWzVRH+o5wHQUA6xX8SxtSgU1CUDRtuyR4kXV8IPkJhKELbSgb9c5N1K/aN4jwzDXSrN2aQnhUCtPSOdl1V/idHDplG3OgbAsbKFpSk5UKICkiwobQ8m3EZuzbATxJpck8zqYGndnQs56ZVdDY/hArcg6092lCoEJNRwNLimpvxjJHJNPvgdP05tNdg081lUMxqDoRpAjjJQsKQb9RX4G0PHJR14k5kUUa0Nq+QFBEMywWwAUXprqPWFTyp82Ox/Am7bJQJVfMOppx/tEjmNON0z0GatPI08oeyC2wmlACemsK8dkUqFbUGv8AKEucXwaceSnTRJKYzmANr8axtNOrWQEqTlqK3vTjFXUrgkdBBshMZVJKwSkGiwORFLdeVeIEW9NVY1vm4hO1hUlKVoSbakC1OsCSr6vm/amoJJsdeQtygw4irKsAZhoK8NL8j/OBmn3HjvUCBQnyOnw+Ii8aoTOUqSYWSVZQo7xArDvBJJDhWhaiFZatjgaXVfnQGEcvMILgKiBVQFa8NIvUuUZRloKaEemsTHW+3/RmzTcY0ijTktmWvsUqWhOZQNL5E+8fKIpdxRFTppFvXJt76BTeACgDRQTXpoDTwtCyc2eWUgIUABcVH4RSSvpFo549Mgw6VU4VFIHSpsOml4WPyHzdRzJNSTTl5RcsGl+zQEnUCkGzsohxOVYBESt0RbzVL6ANnGwlF9TrDZxUVdyb7FeQ1HI8CINdxLKmtCa8oRHJtjtovk08r3eGeYlLCucpBIuoVKQoc6jRQ5xAmYSqy/aJ90qPtE+DiaGB5xbjjZNwaVpzHKEMlOrdcS02klz6vLmTyENw6jNFVDgL0sZK5Fx+Z9vRCwHkc12db5ELT3vgYKmNmmnEBDgLlNFK737wvDnCsPDSAmtVe8ev4QU5QcY6s3klFOTr+DmVFP2lXnNj23UBBJoLJJuR5m9POOdY5syplTmRXaJbNF076eWZOtOukdq7caCKztjgucofbWWnhuhQ7p1ICuh0vaDp2ursE77OMOCJAmLFiGHBxZQpAYmvqaNu9UHQKPLQ8OUI1tFJyqBBFiDrGsVdmoEFIMDgROiCA3MZG1IyIQ6OlkTDfazHsJFu6GtC4BopVOHIcYCx+fWttK8oZaAow2RvqrQVI90HgKQe7NB0fPJmqZZB9gz9c6BZTxr7o/vAimitxE1NHKon2TOvZp4KV+kf66DM16bsOK1NNB2z+FlCApY3zc9OQhuXAID/AMQTTWA3pom/COFLKkrRv2Sm7YTNz/AQscm1E3sI8mF8YUzuIACkI9Vt/ZphhQauavr4Q4wx8OpyKUCrhX3h069PTlFFTiqK0UaHgYZyTx1+EZXFwdtDpY7Q+nJDKKo9IqWNza0JII71gNf7cbxaJTEDobiI8WwduYTrQjuq4g9ekHDlSmrKpuPZQEOrzAEaQ7DCy0eANPP+0J3wpMwpBtl70WOUm6tFPLQc43z6THyk6TQqViiGEUICiefpz0jXZpxTqig7oUSb8ExGcDW87vFKUgVua1IvoIwoVLvCprUajS5/lEi4uNLl9lZRfY8n5CXzJbTUqIvU2r5HSkS/4utgZQgr0AAhfh74LhUq5Pd8IExzFC04kg5gR6UiRlckhMoWqZdJGRcWpDhJSvLRVBZQ5GvI39YZy82QezWKLSBU0ok3It6fGE+EbToS2lSiBUC0Y/tCy+rdUlKhoo/HWHrURlGvP8GGWGafXBY1JqKiIFzABCVHLW2Y6QMjFG0i6hTnAWJTaHmzlNqVzfYRCcjild8hhFt0wTFUJdJNa5FEJIGorrfnQQkmZ90hQKgAKWJA5kUGvA6QNhmLUKkk1oaeMEYhIodcDgqlWWh4ixr5fyhcWk6kdFR20mMsMxmoykVUpNKk901NaCmtKevoO1j7Eo+tZbotdAojUU5dDrC5lWRYSRQ0vTx73TURptng7jiu2QEqGQFVDc68OYEM9P3J3SLJQ5i12XOX2yZc/K08bQY3iratHEnzjgxVxBMTy80uoAJrAyaOcv8A2/2I9OC8Hem8QQD3x6xvNzjD6FMqVUKHum45EHgQY4/Ky7pN1UiyYPLlopUom+nrFIRyYfxdgnpotcsZ4pKJtLzhzIP0EyBcHkeSunGEU7LErEvNEB38jMe64OAUfhm8jzi69ol1Cm3EhTatQftHIxU52VDJ+azJKpZw+xePeaVpc8uY847mLUQyddnKyYZQZWpiXU2ooWCFA3BjVsxYvmqlq+ZzBAmEijDpNnE+6knj+ifKEDrKkKKFiikkgg8xD6FHpMZHoMZAIXucxAvvJfoAy2aS6CLEi3aEfZ4DzVYjNrWqgJKibniSYZTEuoJsLAUAHACFLCgHE1tf4xgnmcnbOjixRS4GLQDachO8dTzMGNTCE0Kt4W3a0r5jSIn5XP484GVhpT70cqTk3uZsSjVEWJa1TQDWmauv33hHMnNbjp4wydl13saeMLW298A2vWDjq7Y26QJMSVBcAxFh2MKQsNkFYNhS5H4iLPuGu4FeNfuMA4e0nMKIQCM28K5zWneqaU5UHOGOanF7kVTGTb4yZsyf1SaK9DqPCsbys3RVQTaCWZRDh30hSgOWgGp/nCvEZMIBKCacQTGJwh4IuXQRibbLvtCN7Q0PAQE+6hIoi32whfxCpyJNhrEyXKi8O9OdJSZvwYEkmOsNWaqJgDadlQ36WpTzEFSToQkHzvpDSZm2VSykEFRUkgqCyNelCDe/lEwL/JYvVy2rhFSweaCVHMbEcYhxmZSVpNjf4QjeQrPkB0h1heE5d9wg3FtY2uEYPc2Zb3MtmASmdJIRugVOmg431hbtBLpQnMixAUa00saaxKmbUpWVBIoLkGlK21HSJXpJK0lCq0PIxk9RRkhiwSfLE+COpW2SpW8bVN9fGDpyUmshS2rMmmidadIiGzSANxaget/spDSRkXECgV8TF3ljdplZ4mimygUFp4GsXiVmAAFgkKpSx4Gx1toTFdxHAJlSgoKbr+sa/BMStYTMqASpaB1BJ+FBF5yi2pJomxyVESJxYmQ6UdoBYpJNFJIIIJTf+hDvCcSQoqQaj6pNqcxSp0iRnDyhKVFYPZitCmiVUqSFEGtDUjz6Qpk2C64pDYQmuZyiiAahNVBJpfSyennDItZYbYvkrLj8kL8Q2XdupsAoqaU1AryiPC8KLSs66V4dIt+C40G2l50pVupCSo3FeKQNdP64h4kUPhSmxcU496v6OtddIG+W2mUp7uUDyZzuWv4RYWaiihZVCNOB1iiSk8Wl160MWmSxfME0Armuenh01iklXNjZwdcFjk1AmiiL6UH4WESTsgh9CmlmiTofqngfKKtOYuQ9lTw184sODYokjs3BVKgSDTeCuFNCR0gYcjjNbv7MmXE9tiBEgX21yLu7Ny1SyqvfSL0B9KeIPOBnSZ1hSyKTcuKOilC4gWz0+sNDDLH19u2J1g0elVlK+qUml+dPsVEGMr7NTWJsChNO1RWxJG8D0UK+YrxEehTtWcZoqgpGRdHNjPnB7eWUOxcopFdQCKkeRqPKMibWSw56cOggVbbaiCsDxH2xECa3gWbmwONI805ySu+T1cdPF8JDNqdAVTnE7z4pWK0wpbh3OGp5Q3bRmteg58YEU69wjPjjGXBo5NEndSTHpw4HeUL9OH4weJcAWAjVLhTxpWxFbfEQu1fAq/gVuyBSDQ2I4X/tEWE4blJqv8YbTSUpJINaa0UPgb+tISLnkZu9SsHdJcFoK0N3potBWUkBQorqNaQkncTHZmppBE06nL3qp56RT8QUVryJVnHAAVNeGmpg4cbm+fBdbYqyBJFajQk/bWG+HJr98Ry2zc3lzdiSOWZOb0rDbD8Hd0Wko6HWH5pquGbMWpgocsV45O0GQe9r0H84PwHCHXGiqpCSRlBNKj3j3T5H7YIncFbSCVX8deUWOVeo2EiwpaFrKoxqJjzZd/K6Od49sy8yvtU90qprUp5VPHlWghe5iLyN00/rlHU5yW7ZtSCQK2iiYxhRZIBHUHhD8edT4mhUF8MM2RzFCyvXN9w/nDwxV9l8TCVLQq1SCDwi1pWDcG0Zc6ayM6OP8UbBMSJMDrNTrGynE8/KEdBcbNluVNEDxMFtJABJIsP6A6winMYQiia3rSg184YdlmQlVTmqTThwp9/oItz54RTJ7UTLeSapWk066GFH+CJKypBcpmNCCDS2gBFTrqIYYk2FIoLEC5r6QtwmZWmtDcCh0rcEE05a+Fofje1XBmV27YSjBAaZV6cDoeloklmkNrUVZUKrUAaCvAdIIlZqxKjA0xMg0dArlNLivqP61i+5yRTk8xWVaJzBINdT9sJ3yuXDjqEFTaL3ItU2qfwh5ic6X0pLTYbCUivGp94nx+GkSSLHaMPNG5UhVbcaf2hi4pS5RSUpKD+Srowl51t59l8lQQl7S5QuxArxSoKH7MWCbmqy8jijY3m8rTwHSoP3+ogT5M3fokK7qlPsK5UWkOp+KV/vQ02dw49jieHn3faN+YqPilPrHbhBLo485t9sYKdQziCVWLE8i493PofWv8QgPDG0tuzGGvKqk1DdR7lMySDxIsf2RABUX8HSsH2kqsUPEAHL9mQ+USbXzO7I4igXICV+KbgHyKhDRJV14jMyxUwHVo7NSk5QbA1NfjU+cZHSJvZyUmVdutVFLCSb9AAfMAHzjIG1kEM5OhI1FYrk0tSiSLkmLhJYDLCpJLpGqjYfuj8TATuFpcqpAS2kEigGtONo8zjlG/k9X/2opVH+2eYM4hspY94XX1J4+EWVCBS0V/BcIQ3vm61aq/rhFgU6gAgkg0tQVqeHxi+Sr4ZgyStmi13pCXF5ilaagw+wEBS1JWQkFCgSeFqg+VIQ4zLXJBrS1efWM232qXyMxtKdMRz06QnvUOltYTfM3XQcqfW0SPL9oRD+UfyJSnnGqT9NKux/Pgrr2DTZSElWZPJJ/ECsWHYPClNrcUtOU0ASLc7/AHQ6UqiaiCtnd9S1cBSAs05rZwZMnEWx0hsRstoEXEeJfSSUgG3HhEzbRIJ4DUxR4pLrkybiv4tguYVQadDofwhU+5QUJpThxi7ZLRzjbZ/sJlNe6tNfMWUPsPnE9CVcGjBk3PaxjJOqtlpGmNSRm28laKTcc9D8P5QmYxJKhQGJDOOLVmqVXuTcnzikYOMrNeyyrKwaYZKiBnp3kgX8usESU+r3SQeINQfSOhSCk5d4G40A48LmFOLYWhzeoKjjxh71G78kHDkcJUuhK3Muq4E+cSTDb9L1A6Q0wpYQoJXShNArryMWf5mFDnGaWSnwh89U4s5U8g5gOsX7DX8zaTUVgDafAghtTthT4+EJ8FxxCEkFaQkXuaEQ3LB5caaQqWVTVosc/vIXCNtgg1g9jGJd1CiHE21JNPtgGXxZKlFKKUHvdIrCE4qqBCSJlOGmUCkFSGgQSkBSwCVGiR1J4DSPGkpUalQv1H3RNMSYyBwX1qNPAjnF4v5RWUl0M3XGkJKQMxqd4HcI9K+dY82eSC4qmhEIJZ4qTY1vpyhns6+Qt0fVTX8fti6T5QmcaixVsUAkOGl0zktfopbiPvi7y+7jjieDksK9aFP4RR9kEEsqUnVc5KJvzClLP2g+UXCUmO0x40NShlaVeR0+Ij0EOkjhy7Yj2Uaq3iUtwAcoOtFU/wBkDSh7bBHU8WXAoeFb/BcMNh7z08OBLg+LsC7I0VIz7YBADaiamu8E8Om7Fyo02ZmwuVaJIqE5f3SU/dHkUbD8UU22lA4V+JJ++Milhosez08bgmtY8mJtwBYBOp9IquET2R1CjpW/nDpzEkhxTS1AEkkVtVJvY/dHnp4XCfB6BNdlgYmKIqL0FoJlpsKAMIHpsJTljeWnaDrCnFgcbRYCuhJgOam0itf5enGFkxiQA71IqmN48TVKDf7IOHDOUuANKKtjGUYDrygjnx5fzho3LKWtKR3RYmKlhgebBcrSvDnF22LxRK00VTMCaw/PGuey6m6ssm6EUpYClIqr+OCVeOWuVQ3h14ffFsnVJI3ft4/hHOdpnSlTlSQFpoKDWikqvyFUg16CEYEpz2sXHp2XHDsfLgz5SEVpQ2JPS/CHrWMAgBRKU6gH0r10jnUjOgspCOAiZjGXkg0VY0BBAUk0sKpUCDbpD43FteCPSqStHSmZ5ChZQPnFH+VBoKZS5xQv4KsfiEwsW8qmdKqHjSwr4C1IRY3i7zqC0s2FD400huKcm6Yp6V43uTF+HzNDFuwufbyaxRsOcGYpPK0TNv5VinpDMuHcxsMiapnUZKYARoenxgNKgpZJVamnCF2GY8UlBWhK0pF0K7qrEXpxFbGPJFyqsx0rGKWPyNUWrGL0jmra0aSu0vzZSmnanLTKdSRT7YbNulQNDZQ/oGK5tJh1AHABYip6GKY9snTKvnhge0WNvThACShpOg5nr1ivf4MtWnnHQ5bEAuVRKFCQhK8+ZI360NqcSSQKxp8zbDaSFgk94CtQettPCukbPUUF7BaiumitYbsw2pBJrXnA0jgi730JHjSLmlxIsAf64wqnGloWtYVRIANOZJoR9prCI5pybVjVHkQl8tuZVkhPPlDue2ibDICFpUo2oDoOZ/CFWKuB4gpFhqesbSeF1HEBVBT63K3jDdsXTki8otqwWXmHARlUL8IuPZGXkX3FkBaxlGXrYXGupMASGDpDiW0De948oK2vq89L4ezqSM3Qnn+qmpMMxf5MiSRj1OTbAM2Gw8hMg3xW49NKHHKhPZt+pIMMdkXA7ik9MDuISUg/tD/wJiaSmkNJnJxP0TDYlZfqGxQkeKyPQwq2dT82weYmFWW+VZed/Zp+JUY7SVHGIvk1czOzj55FVfJ0n7REGwn/ACc+vm2v/b/+ok2aHzfCZl42LgUE/tkND/ar1jMHR2GCzLhN3TQftFKKfwmIQpsuk5RGRb9ndn88uhRFDVYIOtlqH3RkCmQ564oZqpPwvXwiTHz2hbVa4v5axbdkcJYxJpbS19lNtDvAd9Pur68iPO1RDLBdk2ZmUfk1jsp1o0VW9FaoWnm0v7yOAjIsMm0zfLUR20c+lMPdSKjSunCCEzL6OFuXCD8BQppTks+MjrRNUnUjpzHXkQYZTMlyuOkYM2Vxm4zR3dLjx5MacWVWamnF2NvCAQnKQaVoQYs7shXhGS8shSiCgBAoKUuSL1JPxpT8bwzRUSmbSPcqI2UrfTVIojmrTy5xvL4Q42atr3odI5aDhEyUikY5Z5dLo0R00F32L2sXfb+lQs9UCvwir7QYop1daUHLiPHkekXxEBYzgbcwklIAWND+PMQMOfHCdyj+xOo07a9jK3szMZgpJFhr5w/ekFBOdPmIQYJ7FxTTgoT9o/lFykBalajSGame2fHQiDair7NcJk91QcRzqCKH8RAOLyMtlqK5iOBOt+EPplRIpUkmt639YqzrJ7RSOAAOtKVUBb6x/DpCMUnKTYU03ciqnCilZOa1bc/GInE0VWtYs07Ip4qOb+qRVptopVHVxZN65MU4KD4LJhyC5S0WBLGTKOesCbLookWixONgkEjjHOz5qdG1vkklkhCbVorXkacPsPmIDxl9AaKDdS7BP39ALGHhQMpoB98J5jCM6wo1pSlOl+PmYzqcVNSYlOxHIFSQaag0+PAxOh/ePxA/laDv+HCgFTbi1GtSHCCKcaUAIP8AXhsplLaSojKRrWGucZcoYpIXTji0ILmgHryg/YvDjOErmCS2ahKdKmwqSL0H2wB/w8t4ZnXFIRm3G6a8aqPC3xi67PSyW8qUgADloIpkyrFUV3f+imSdwdFTx/AlSTtAKtq7ivuPUVjyVsntDrSiR9sX3bGXDsqa6oKSPWh+BivYZhwSntXjlbQLV0AEasjuVIpDPeO5dmssUyjCpl3vHujmToIS7PtupbXNm81OKUzKjiM30jnQAWB4UPOPHXTiT6lrJakZe61abvIc3FfAeVbC1N9k2vEnUBB7Ps5Jkg0bapRJIGhVb1A4x1dJg9ONvs5Ooy75Ae10vaVwhg1O5mI4m+ZR8N5Xr0jT5SXx/lsNYFcuQUHM7rY+NfOC9lG+wZdxac760+yTfunSlTWqzTyvxMKdiZRUzMOz0waJBUSo6aVWQeASg0HVQ5RrM5Pt66GZSWk275qLI5pSMiLcM3e8axvtaEsyslJc6OucsqRf13j5QHgxOJ4oX1CjaDmpySmyB8M3kYx+bE9iK119kkhCeQab3lnwNKf9URCFpw93sWkNqTvBKSr9ZQClceZMeRu/tVLy57J1NVihV0Kxnp5ZqeUZFiUU7bXAlyr6Z+UJCapUVJNr0Pu6tr9KnkRD2SnP8RbbnpTK1iEuCFtk2Wn3m1c0KpVJ4GK/sdtOGQZKb+hJKQVCvZk2UlQP5M3B5X8tMbwV/DJgTcqT2XPUAH3V07yDwV4VoYoWLDj+DtYwx84l/ZTrO6pKrLSoXLa/OuVX8xFDw/GFoX2EwktupOU1FL8iOB+BjoUlNInz87kVhieQmjjau64n6qx7yeSxcdOEWJYdLYuC04gymINi6SN7xH51qvEXFRpW6c+njlXJr0urngfHXwV1T6SKmnjy9L/aYEa3h1jxaX8PX2M+yVNmyHU39Dor9U0VDc4clxHayy0uI/R4dCNUnoY4uTDLDw1+zv4dfjyfQInSN0PCnrA5evlNUnkdY3Q4CacP6rGdxs1yn8BLa63pSJ2XKRCSKV4eMZmppCmrLLlCbbfDCR84b1SKqA1y8/I38DBmxk2483ZAJBob0qekTYpMkMq4kgj1F/tg35MpIJSpdbbtuANKeZ1EaL3YKl4fBzdTHZLchy7hExTMkIJ5ZiD8RT4xTMQkplBUXWlNkm1wU9N5NRHWFrtCXaR8CWeJ4NrI8QDT4wvHKMXtRihmlfJzHEc6E1Ury/lzitzs0pZqVFVBQVNbXtfhcw6ammcpU82t9013VLyMp5GjdFrPTMkeMV+ZRewpXgNB63js4se1csGTI5eC6bIz26AYtqHQY5rgj+WnhFrk3jrXWOXqcPvbNKdpFsQoc7QalxOXiFVFLWKb1+NIrTM5lNCYZInBQVBodDS0ZEmm6RWURs0oHTiaUrf8I2MslSTVNj6fhCZyYpx8YOYmqJ1txiRyeGissb7RuuXQk246nnGCfSiwueAFzWNplAWkjUc+n3Qmnsdk5AEJo49S4HC3vK4eGsMjp/UmnEXKaivcPZnFMrJW/wCzRS9b16eMU1Uy9iq1JSrsJNq63Fd0Ac+a6aDhGr0g7MgTeJuGXl6+zbA9o50bb1FfrG/leHrzTaWUOziPm0ki8vJD6R0jRTo1JOtDzv17ml0ez3T5Zz82fdxHo9lm5cspccBZwxg1aQrvzTn11D3gToOPhAuGSy8WmlTT2ZEk17qjuqy3CeVOKj5cbDyErMY092jnspRs0FNAB7iCdTzVoPICI9stpwsJw6QHsRRByauGvdTzTXjxPx6BmIdqsZXic0iWl7MINE2tQd5wgcANBy6mDdtJ5MpLIw9kUUoAuaZgitQkkaqUd4+J4GCMOYawmV7dwBb7ncTzULgD/TRY5h3jfQJhZsfhxeW5ic4o9kgleY+8scQOhsOvhEATTv8A6dhoaFpmausjVKLV+5P7xEb7CyQZl1zLlgpOb/pINaftqoOooYRLcXic6pxQIbFyB7radEjkSPvOgMNNu8SLbaZMKqquZ2gACRUlpqgsAhJ0qbnWJ9kKhiU2p51bqjdaio+cZHQcF+TZC2G1vPFtxQqpFt2twD1pSvWMiUwgu0uBNTTfzqWUk2HSnJK+QHBXDQ2oQu2U2tVK1lZtJUwKpIUKrbrqKHVHNPpyhPhOKvyTu7UG+dFLFI49R3vC+h0s7srKYk3VkZH0i6K3SP0QQM6L92opwpoRZDXG9k1NFM5hrhUjvpDZqpPMo+snmk34XgmT2klcQSlqeHYTCPophBy0VzC/yZrwNuV4rEhic3hrhTSrajvINS2sjWnFKx5KFqiLQ5LSGKgqaPYTNKqSdVEc0/lPFO9z5RAjfEZ+Zl2i3PMpnJYj6dCakppbtEDun9MW+2KvKYE06rt8HmilwXMs4rK4ByGay0/rVHWMk8UxDC6BY7WWrS9SixoQlWrauGVXpBikYViCszajJTFag2SCrnY5a15FJgSSlwwptdATuOJKuxxCXU04PfSmh8Sg8OqSY2VIgjOw4l5HHKb+Y1HmIaTycQYRkm5dGIyw0Vq4kcwoDOD1of1or6cMw+YNZScVKO8GpiwB5B0G3mSYw5dBF/hwbcGunDvlEnbHunXraPVGl4Gn8MxWXu6x84bGi0DtBToUb3mRCwY82bKStChqNaHwNDHPno8sXyjs4f8AksUlXQXiswSAkcTT1tbyjoGzsl2TABFCbmKPskymZmEqJqhvePjw+/0jpDzopGbU+yGwz6rMskqj0TKXaK9tYv8AyzvVJHrb74ZLdMKMaQXW1NjVQt46086U84Rijc0Zo8M5ipqB5hi0W8bLP/V+MSo2PePAesdhZ4oe1H5KLLPFBi14PiqFJpUVF6cYZPbCE3UtCB4/aTb+8APbLSDX0s8kHklaa+QFTAm8eT5F+ptNprEUBVbEeMGs4slyg5QixJ/DAnKhyYdIGosPVdKwpwuUmlqrKsOKFbWJHmqyfjAjpbjxx/JR6mPk6GXhSDpZaKa6dYq81JzLDYXNPSrBIrkU5mWf2UA9NI02cVNzJozLuKR+cACW+XeXQEeBJ6QuWgn8AWqi/Je5WaCTrqKeVrfCJH5DMoPS0sy5NUAQpzuouN88KgefLlAU4xLSaQudfAV+abuo9P50ELGsVn8Qq1JMiXljulypFeFS5qo9Eg9YfpNHlxz3SdfXkRqM8JKlyE4jOy8iovPu/PZ/gpX0bR5JSNKHl17ukRYds0/OH55ijnZsgVCVbpI1FdOzRwpr4axO3KYdhAC3lfOZylQLVSTyFw3+saq5RXpyfnsXcoN1kK0FezSetLuOU4Cp6AR1jAG7T7XqmcsjIIKWe4AgUU50AHdR/cwfhGEMYYz86mSFOKG6Em6v0Efo/WXxFhbvbufM8IaKSkOzK00KDSpB/OfUR+gCa8a6hPhOETOKOmZmllLIFSo7oyjggaJQL73Q6mtCA0w6SfxaZU+8crKe8a0SlIvkSeAA1PCvMgRFtrtIHssrLWl2qBISPpFCwNBw4ARvthtSgoEnJ7kukUUQKdoRX+Hj1rUwdsls8mWR88mz2eShodUcgB+eVpT3Aa96mWEDcHl0YZK9u7QuK7qD7zovlryRx6iguDVLsdh4edcn5o+xZVnVX8o6bpSOd6E+XONKvYvOBCR2bKQLe4y0nieFdfEnlEm2mNN5USMoAGGuPFRvVRPEm/r1iEE+ObXF19xyg3lc/L0jyKdMJ3j4x5FLL0XpOKNvjspwBLnuvjidKroLG1Mw5bwNICxHDHpZQWCRTeQ6g2I0B3e741oajSJptpL1C6UocPdfH0Tp5OUG4vmr1HGIZTEn5QlpxGZGpaX3T+khQ0r9ZNj1iALBh+1jL6eyn0gKIA7YJrmArTOkai+o0ramsD4xsetsB2XWFtmikqCreKXPd8FEfrKMQpl2JlJTLLCSan5u5zOpRTjbVF+aYXyM9NyLlEFSKm6FXQo8qaE0pyMSyDiQ25mWvYzaVOoBFQolLtBwJ99PRQvzgwYPh89/y7gacIumySVdWVbpH/xrHhELe0UlNjJMthlXBVCpqvlRTddd0jqTA+IbDkjPLrDiTplOdHTfQKg9Cmg+tFgB3+GYvh4HYqLjSSTRG8m/NsjMPKIZja+VmCUz8ilShZS2t1fjRVF/xeULpTaDEZIUKlFsWo5vt+AWCaeAUIeo25kphIE7K35hIWnlau8nyMQJphuGSta4Zi7kur804rd8Miso9QqDMXlMUIpMS0pOpHvpADlOFzQA+AMAP7PYRMgdjNdmeCSunXuvUOvAHjGyNi8QZFZOcqOAzqQPQZkxWg2QbMTzTBdS4yqVUSDRwHKeFlEUty6wVO7byoISl0LNdBp+9pEUzOY4zZTSXvEIUfLIoK9RALu1U0KiYwtKuZLawP4kKjn5NBjnPdKx8czSGLe0ZcJAdlUXpvvH7Am/kYTT7TrjgWnFpJNOCXS2Bz0BJ8zHqtpsP/KYU2k9Mtf9gjU7RYRauHX40ULeFxD8emxQ6RR5JM8+ZzHHFpX/AO4v7kxqrDq/SYyz+y66v4AXicbR4QB/7ea9Vj/yjBtPJE+xwhpdOKqKPoEH7YeoQXhFN0vkTP4bhwPtsUU50RKuE/vLVT4RNLYdI19jKT81yK/ZoP8A2gVesOP+JZs0EvhqUdUS6j8QAIKZax94boU2K6+zR/u3qeUVab4SDfySSODTh/5XCJaXA0dfopX8RzA+RjeZwgoP+fxdtuxBbZCdOICR96I9Hyc4i9ebnsqeILi3PgcqR6x7/wAMYJKn/MzZfWNUhVb691kFQ81RfZ1ZXcAs4vgsqoCVk3Jx491TgrU2pZQNP2UQ5b/x6fpQJkmeFsqsvgarJpw3RAw29lGBkw6QvTUgJ01O5VahzqRpC1/EcXxAJ3y204aBKPZpI/3L8ASTyiwBqvB8Iw5dZx5U3M0qUkZhXlkBoD+uowNiO3M5OHsZFktIpQZBVzL+vYNp00pSmsTSXydyrCQ5PPhIuaKVkB5Glc6vDcNoyf29lZcZJBgGmi1jKgHmlsXUf0lb3UwevojZrg+wiEJMxiDoCAd4FRCeff7zh0smgNbKMR4ptuAPm2GtlNdwOZd8jk2hIogGlbDrreF8vhE/ibnaTC1BIuSuwSOibJQPGltKwxXjUjhyckqhMw/7y9Wweq7FzwFE9AYhU1wjZJDSfneJuBKdQgmpUdb/AJxXQbvMm4C3ajbBybIl5dCm2KgJbTdbh0GamvRItC3/ADmJPFSipw8VGzaAdBYUHRIBJ4Axc0YZLYS12r3tH1ghKKgLXzrSvZt8wLnifdECC7O7NtyjfzycUE5e6NaHgEDRbn6WieFTdKyZmZnFpkNMpytJ7qK7jSOKlHieZ1MZKSk5i7xcWoIZR3lkUaaTyQOJ6epg/HMfalGjJSApX6Rw95Z5qPLp/aCA8x7FmpNr5jImtfpXeLiudeCRwH9GnBFONSdT1jdhGpJqo6k61j1YvBIJpqXqsxkM1IEZFaL2bMTTjRqKKSdQRVCx1HHx16w/kpph5HZ0A5MOKpQ/6Tp0PQ061iiSk+pFtU8jDJsocG4QDxSfu5xQFDaf2dUFHsSpRH5NQo8nwGi/FNzyjeT2nWB2c0jt0CxzWdFOGY96n1VVgZnFnWwG3Uh1saIXen6jgunyMOmZyUmRlcFVWp2qgl0dEvCyxyCx5wSEhwtibbyyrqK6hCwA6m+grcg9DQUsICOEzErvMOuNuAVUi4rQajKN4cs6R5xDO7KHN7ByprZDu45XXdV3HD1SqNmdoJyWPZTAWpPBDyc3mCoVPkoRCBsnt25b5yyl21O0ScjlNDvJsfC0El7Cpm5PYqPBaMv8bRAPioGNG8YlHjVaezWbZkqofMrIIT0S4Y0mdlWV1Lbtga7woDXgFLyg6fWOsGyGObD5xml3Q4P0VIcHrVBH7phe5s5Oy5JQopodUrU38VhIPkTEE1szMNHMkeBBp6KICfQmPWcXxFkbrj1Bz30/GopAIFjGsWb0U+oDjkDif3gFD4xIPlEnW7OBuv6TZB9AoQINuZnRxDDtPrtCvwpE3/8AQLUVLI/YdWgegiWELT8pbp7zLZ50KhW1OZpGy/lPtQybZ/6n4ogRW10sob8mq/J2p/iTET2OyCklJlF31IUjN5KCaiByQYj5TzUESaRQfnTQ+iIkV8qboFmGk9CtR+wAfGE0rjGHt3TKu16uJP8AuBpBqNs5dPdlF+PbFJ/gAg2wUbJ+UCddNW2WrqrVLSlmtr3J5DhwjdeKYw7UZ3mxTd9mhlJ53XkIHhWI3vlB+rLJp/qvLWP3SaQOjbycUT2DbSD/AKTNVet4N/ZCZnZCemFAvOBehopxbppXm2FJp+0IatfJ/LsAKm5kIpeilobr0oCtRp5QkEzi81bPMEcblA80pofhE0v8n0wRnfcQ0nipRHxLhSR6GJ+iDVGMYRKj2SC84K3bQUj/ALjxU4PFJHhAU18ok47uSraWbXyArcI5qWqp84z/AA7CZYe1eMwsXyt1WPJW4j1Coie24bbATKSbaKaKd3yOoQAEJPUCDYCKR2RnJr2zyiEm6nHFWpzzqNKeBNOUGpmMMkboJm3hplJS2D1c1P7IAPKEK3p/EVV9q/T/ALafOyEfCH+DfJ2pSQ486ns9SULAbHi8q3PuJV4iIvoglxTaWbnVBkVCSdxhlJCf3U3V51h7s18nS3B2kwQlIuUhVE9czotahqEVPMphi9tBh0gkol0iYXlopKBRgnmtaqrd8CojlSF6ZbE8V33V9jLc1bjIH6KBdz+rxADjENsJWSb7GRAdeG6FhNGUE65UjvHwrXiowrkNlluKM3irik13uzJ9sscM35tHofCDg5IYUmrftH6WcWKuE/6aNEDqb86xS8Zxp+bVVwlKT7tbn9Y8YtXyCx1tFtepwdhK0bYTQJCRRKaClE0pU8a9YrrDYHWup4xqEjQRO0IIT0IjHBEoEauRAEBT4RkSZYyBQbKiY8SYyMhQwtUhvNDNfXW/LnC4CyvD7xHkZEQCybBLK3HGlkqby1yKuitR7ptFm2UHauTDTm+2lW6he8gW4JNhGRkRdkfRQccbCZh1KQAAo0AFAPACAGZlbZq2tSDXVKiPsjIyCwF4mXlIQ0pCihSinMUkgm/EjWLThzKXEVcSFmguoVPdHExkZAYSpbQGjuUWTe3D0hRh0o2QSUIJzG5SK6RkZFQkeJSyAmyEjTRIhA5GRkWIaphrhLKVOpCkgimhFRqIyMiEOqYRhLCQkpYaBqLhtIPHpD6Wk2wLNoH7I/CPYyLooyhfKPiLzZIbdcQLd1ZHLkY53NTC1kFa1KNBdRJOg5x7GRR9liIRZ/k7lG3Z1CXEJWmh3VpChw4G0ZGQV2A6vgCAuYLawFIQCUIVdKSDYpSbA9RHL/lHnXVTjiFOLUhJ3UlRKR4AmgjyMi8ugIK+SmUbcngHEJWAlRAUkEAilDQ8Yvu1zyqu7x3Ubtza3DlGRkGHQJHFpNZUpalEqVXU3PHiYKHCMjIqgmyYITpHkZFmVCOAjVyMjIhCCsZGRkAJ/9k="]},
-}
+@st.cache_resource(max_entries=2)
+def load_label_content(path: str, mtime_ns: int, vocab: tuple[str, ...]):
+    """매니페스트 → {라벨: HTML 조각}. mtime이 바뀌면 새로 만든다 (hot reload)."""
+    return build_label_content(path, list(vocab), ASSET_DIR, ASSET_URL)
+
+try:
+    CONTENT_HTML, _content_problems = load_label_content(
+        CONTENT_MANIFEST, os.stat(CONTENT_MANIFEST).st_mtime_ns, tuple(labels))
+except (OSError, ValueError) as e:   # 파일 없음 / TOML·JSON 문법 오류
+    CONTENT_HTML, _content_problems = {}, [f"{CONTENT_MANIFEST}: {e}"]
+for _msg in _content_problems:
+    st.sidebar.warning(f"콘텐츠 매니페스트: {_msg}")
 
 # ======================
 # 유틸
 # ======================
 def load_pil_from_bytes(b: bytes) -> Image.Image:
-    pil = Image.open(BytesIO(b))
-    pil = ImageOps.exif_transpose(pil)
-    if pil.mode != "RGB": pil = pil.convert("RGB")
-    return pil
-
-def yt_id_from_url(url: str) -> str | None:
-    if not url: return None
-    pats = [r"(?:v=|/)([0-9A-Za-z_-]{11})(?:\?|&|/|$)", r"youtu\.be/([0-9A-Za-z_-]{11})"]
-    for p in pats:
-        m = re.search(p, url)
-        if m: return m.group(1)
-    return None
-
-def yt_thumb(url: str) -> str | None:
-    vid = yt_id_from_url(url)
-    return f"https://img.youtube.com/vi/{vid}/hqdefault.jpg" if vid else None
-
-def pick_top3(lst):
-    return [x for x in lst if isinstance(x, str) and x.strip()][:3]
-
-def get_content_for_label(label: str):
-    """라벨명으로 콘텐츠 반환 (texts, images, videos). 없으면 빈 리스트."""
-    cfg = CONTENT_BY_LABEL.get(label, {})
-    return (
-        pick_top3(cfg.get("texts", [])),
-        pick_top3(cfg.get("images", [])),
-        pick_top3(cfg.get("videos", [])),
+    """축소 디코딩 + EXIF 회전 + RGB 변환을 한 번에 (미리보기 없음)."""
+    return decode_image(b, min_side=MODEL_MIN_SIDE).work
+
+def predict_pil(pil: Image.Image) -> Prediction:
+    if getattr(backend, "transforms_in_batch", False):
+        x = backend.prepare(pil)   # learner: 변환은 배치 추론 안에서 "transforms"로 기록됨
+    else:
+        with trace.stage("transforms"):
+            x = backend.prepare(pil)
+    with trace.stage("predict"):   # 스케줄러 대기 + 배치 추론
+        return scheduler.predict(x, timeout=SCHED_TIMEOUT_S)
+
+def start_live() -> LiveClassifier:
+    """세션 전용 실시간 분류기. 추론은 공유 스케줄러를 거치므로 다른 세션과 함께 배치된다."""
+    stop_live()
+    clf = LiveClassifier(
+        lambda frame: scheduler.predict(backend.prepare(Image.fromarray(frame)), timeout=SCHED_TIMEOUT_S),
+        labels, window=LIVE_WINDOW, change_threshold=LIVE_CHANGE_THRESHOLD,
+        poll_timeout=max(LIVE_POLL_TIMEOUT, LIVE_REFRESH_S * 4),
     )
+    st.session_state.live = (clf, threading.Event())
+    return clf
+
+def stop_live() -> None:
+    if st.session_state.live:
+        clf, stop = st.session_state.live
+        stop.set()
+        clf.stop()
+        st.session_state.live = None
+
+# 데코레이터는 실행마다 다시 평가되므로, 분류기가 돌고 있는 세션만 주기적으로 갱신한다
+# (시작/정지/종료 시 전체 rerun으로 켜고 끔)
+_live_on = bool(st.session_state.live and st.session_state.live[0].running)
+
+@st.fragment(run_every=LIVE_REFRESH_S if _live_on else None)
+def live_panel():
+    """실시간 결과만 주기적으로 다시 그림 (페이지 전체는 rerun하지 않음)."""
+    if not st.session_state.live:
+        st.caption("동영상을 올리고 시작하면 여기에 실시간 결과가 표시됩니다.")
+        return
+    clf, _ = st.session_state.live
+    if _live_on and not clf.running:
+        st.rerun()   # 분류기가 끝났으면 자동 갱신을 끄도록 전체 rerun
+    r = clf.latest()
+    if clf.error is not None:
+        st.error(f"실시간 분류 중 오류: {clf.error}")
+    if r.label is None:
+        st.caption("첫 프레임 분석 중...")
+        return
+    col_img, col_res = st.columns([1, 1])
+    with col_img:
+        st.image(r.frame, use_container_width=True)
+    with col_res:
+        st.markdown(f'<div class="prediction-box"><h2>{r.label}</h2></div>', unsafe_allow_html=True)
+        top = top_probs(labels, r.probs, PROB_TOP_K)
+        st.markdown(prob_panel_html(top, r.label, len(labels) - len(top)), unsafe_allow_html=True)
+    st.caption(f"입력 {r.fps_in:.1f} fps · 추론 {r.fps_inferred:.1f} fps · 프레임 {r.frames_in} · "
+               f"추론 {r.inferred} · 버림 {r.dropped} · 변화 없음 {r.skipped}"
+               + ("" if clf.running else " · 정지됨"))
+
+def get_content_for_label(label: str) -> str | None:
+    """라벨명으로 미리 만들어 둔 콘텐츠 HTML 반환. 없으면 None."""
+    return CONTENT_HTML.get(label)
+
+# 결과 영역의 표시 전용 위젯(전체 보기 토글, 라벨 선택)은 각 fragment만 다시 실행한다.
+# → 페이지 설정/CSS/모델 로드/디코딩/예측은 건드리지 않음. fragment 인자는 마지막 전체 실행 때 값.
+# fragment 재실행은 페이지 전체의 trace와 별개이므로 각자 Trace로 기록한다.
+@st.fragment
+def prob_panel(pred_key: str, probs, pred_label: str):
+    """확률 막대: 미리 만든 HTML 한 덩어리를 st.markdown 한 번으로."""
+    ftrace = Trace(stage_metrics)
+    t0 = time.perf_counter()
+    st.subheader("상세 예측 확률")
+    show_all = PROB_TOP_K > 0 and len(labels) > PROB_TOP_K and st.toggle(
+        f"전체 {len(labels)}개 라벨 보기", value=False, key="prob_show_all")
+    k = None if show_all else PROB_TOP_K
+    cache = st.session_state.prob_html
+    if cache.get("key") != pred_key:   # 새 예측이면 이전 HTML은 버림
+        cache.clear()
+        cache["key"] = pred_key
+    if k not in cache:   # sort_probs/prob_html은 새 예측(또는 top-k 변경)일 때만 기록됨
+        with ftrace.stage("sort_probs"):
+            top = top_probs(labels, probs, k)
+        with ftrace.stage("prob_html"):
+            cache[k] = prob_panel_html(top, pred_label, len(labels) - len(top))
+    with ftrace.stage("render_probs"):   # 매 실행 기록: st.markdown 한 번
+        st.markdown(cache[k], unsafe_allow_html=True)
+    ftrace.add("fragment:prob_panel", time.perf_counter() - t0)
+    ftrace.emit(backend=backend_name, fragment="prob_panel")
+
+@st.fragment
+def content_panel(pred_label: str):
+    """라벨별 고정 콘텐츠: 라벨을 바꿔도 이 패널만 다시 그림."""
+    ftrace = Trace(stage_metrics)
+    t0 = time.perf_counter()
+    st.subheader("라벨별 고정 콘텐츠")
+    default_idx = labels.index(pred_label) if pred_label in labels else 0
+    info_label = st.selectbox("표시할 라벨 선택", options=labels, index=default_idx)
+    with ftrace.stage("render_content"):
+        content_html = get_content_for_label(info_label)
+        if content_html is None:
+            st.info(f"라벨 `{info_label}`에 대한 콘텐츠가 아직 없습니다. {CONTENT_MANIFEST}에 추가하세요.")
+        else:
+            st.markdown(content_html, unsafe_allow_html=True)
+    ftrace.add("fragment:content_panel", time.perf_counter() - t0)
+    ftrace.emit(backend=backend_name, fragment="content_panel")
 
 # ======================
 # 입력(카메라/업로드)
 # ======================
-tab_cam, tab_file = st.tabs(["📷 카메라로 촬영", "📁 파일 업로드"])
+tab_cam, tab_file, tab_batch, tab_live = st.tabs(
+    ["📷 카메라로 촬영", "📁 파일 업로드", "📦 일괄 분류", "🎥 실시간"])
 new_bytes = None
 
 with tab_cam:
@@ -130,22 +342,99 @@ with tab_file:
     if f is not None:
         new_bytes = f.getvalue()
 
+with tab_batch:
+    files = st.file_uploader("여러 이미지 또는 zip 파일을 업로드하세요",
+                             type=["jpg","png","jpeg","webp","tiff","zip"],
+                             accept_multiple_files=True)
+    bs = st.number_input("배치 크기", min_value=1, max_value=BATCH_MAX_FORWARD,
+                         value=min(BATCH_SIZE, BATCH_MAX_FORWARD), step=1,
+                         help=f"한 번의 forward에 넣는 이미지 수 (최대 {BATCH_MAX_FORWARD}, BATCH_MAX_FORWARD로 조정)")
+    if files and st.button("일괄 분류 실행", type="primary"):
+        total = count_upload_images(files)
+        bar = st.progress(0.0, text=f"0 / {total}")
+        rows = []
+        try:
+            # 배치 크기만큼을 한 조각(forward 한 번)으로 공유 큐에 넣으므로, 조각 사이에 다른 세션의 요청이 끼어든다
+            for chunk in predict_batches(iter_upload_bytes(files),
+                                         lambda b: backend.prepare(load_pil_from_bytes(b)),
+                                         lambda xs: scheduler.predict_many(xs, timeout=SCHED_TIMEOUT_S, slice_size=int(bs)),
+                                         batch_size=int(bs), cache=pred_cache, model_id=BACKEND_ID):
+                rows.extend(chunk)
+                bar.progress(min(len(rows) / max(total, 1), 1.0), text=f"{len(rows)} / {total}")
+        except (SchedulerBusy, TimeoutError):
+            st.warning(f"⏳ 요청이 많아 {len(rows)} / {total}장까지만 처리했습니다. 잠시 후 다시 시도해 주세요.")
+        st.session_state.batch_records = rows_to_records(rows, labels)
+
+    if st.session_state.batch_records:
+        df = pd.DataFrame(st.session_state.batch_records, columns=["파일", "예측", "확률(%)", *labels, "오류"])
+        pct_col = st.column_config.ProgressColumn(format="%.2f%%", min_value=0, max_value=100)
+        st.dataframe(df, hide_index=True, use_container_width=True,
+                     column_config={lbl: pct_col for lbl in ["확률(%)", *labels]})
+        st.download_button("CSV 다운로드", df.to_csv(index=False).encode("utf-8-sig"),
+                           file_name="predictions.csv", mime="text/csv")
+
+with tab_live:
+    video = st.file_uploader("동영상을 업로드하세요 (mp4, mov, avi, webm)",
+                             type=["mp4", "mov", "avi", "webm"])
+    c_start, c_stop = st.columns([1, 1])
+    if video is not None and c_start.button("▶ 실시간 분류 시작", type="primary"):
+        clf = start_live()
+        play_video_bytes(video.getvalue(), os.path.splitext(video.name)[1], clf, st.session_state.live[1])
+        st.rerun()   # live_panel의 자동 갱신을 켜려면 다시 정의되어야 함
+    if c_stop.button("■ 정지"):
+        stop_live()
+        st.rerun()
+
+    if webrtc_streamer is not None:
+        _live = st.session_state.live
+        cam_clf = _live[0] if _live and _live[0].running else None
+
+        def _on_frame(frame):   # webrtc 스레드에서 호출됨
+            if cam_clf is not None:
+                cam_clf.submit(frame.to_ndarray(format="rgb24"))
+            return frame
+
+        ctx = webrtc_streamer(key="live-cam", video_frame_callback=_on_frame,
+                              media_stream_constraints={"video": True, "audio": False})
+        if ctx.state.playing and cam_clf is None:
+            start_live()
+            st.rerun()
+    else:
+        st.caption("웹캠 실시간 분류를 쓰려면 `streamlit-webrtc`를 설치하세요.")
+    live_panel()
+
 if new_bytes:
-    st.session_state.img_bytes = new_bytes
+    digest = image_digest(new_bytes)
+    if digest != st.session_state.img_key:   # 같은 파일이면 다시 디코딩하지 않음
+        try:
+            decoded = decode_image(new_bytes, min_side=MODEL_MIN_SIDE, preview_max=PREVIEW_MAX, trace=trace)
+        except ImageTooLarge as e:
+            st.error(f"⚠️ {e}")
+        except OSError:   # UnidentifiedImageError, 잘린 파일("image file is truncated") 등
+            st.error("⚠️ 이미지 파일을 읽을 수 없습니다.")
+        else:
+            st.session_state.img_key = digest
+            st.session_state.img_work, st.session_state.img_preview = decoded
 
 # ======================
 # 예측 & 레이아웃
 # ======================
-if st.session_state.img_bytes:
+if st.session_state.img_key:
     top_l, top_r = st.columns([1, 1], vertical_alignment="center")
 
-    pil_img = load_pil_from_bytes(st.session_state.img_bytes)
     with top_l:
-        st.image(pil_img, caption="입력 이미지", use_container_width=True)
+        st.image(st.session_state.img_preview, caption="입력 이미지", use_container_width=True)
 
     with st.spinner("🧠 분석 중..."):
-        pred, pred_idx, probs = learner.predict(PILImage.create(np.array(pil_img)))
-        st.session_state.last_prediction = str(pred)
+        key = prediction_key(st.session_state.img_key, BACKEND_ID)
+        try:
+            with trace.stage("inference"):   # 캐시 조회 포함 (hit이면 수 µs)
+                result = pred_cache.get_or_compute(key, lambda: predict_pil(st.session_state.img_work))
+        except (SchedulerBusy, TimeoutError):
+            st.warning("⏳ 요청이 많아 잠시 후 다시 시도해 주세요.")
+            st.stop()
+        probs = result.probs
+        st.session_state.last_prediction = result.label
 
     with top_r:
         st.markdown(
@@ -162,84 +451,38 @@ if st.session_state.img_bytes:
 
     # 왼쪽: 확률 막대
     with left:
-        st.subheader("상세 예측 확률")
-        prob_list = sorted(
-            [(labels[i], float(probs[i])) for i in range(len(labels))],
-            key=lambda x: x[1], reverse=True
-        )
-        for lbl, p in prob_list:
-            pct = p * 100
-            hi = "highlight" if lbl == st.session_state.last_prediction else ""
-            st.markdown(
-                f"""
-                <div class="prob-card">
-                  <div style="display:flex;justify-content:space-between;margin-bottom:6px;">
-                    <strong>{lbl}</strong><span>{pct:.2f}%</span>
-                  </div>
-                  <div class="prob-bar-bg">
-                    <div class="prob-bar-fg {hi}" style="width:{pct:.4f}%;"></div>
-                  </div>
-                </div>
-                """, unsafe_allow_html=True
-            )
+        prob_panel(key, probs, result.label)
 
     # 오른쪽: 정보 패널 (예측 라벨 기본, 다른 라벨로 바꿔보기 가능)
     with right:
-        st.subheader("라벨별 고정 콘텐츠")
-        default_idx = labels.index(st.session_state.last_prediction) if st.session_state.last_prediction in labels else 0
-        info_label = st.selectbox("표시할 라벨 선택", options=labels, index=default_idx)
-
-        texts, images, videos = get_content_for_label(info_label)
-
-        if not any([texts, images, videos]):
-            st.info(f"라벨 `{info_label}`에 대한 콘텐츠가 아직 없습니다. 코드의 CONTENT_BY_LABEL에 추가하세요.")
-        else:
-            # 텍스트
-            if texts:
-                st.markdown('<div class="info-grid">', unsafe_allow_html=True)
-                for t in texts:
-                    st.markdown(f"""
-                    <div class="card" style="grid-column:span 12;">
-                      <h4>텍스트</h4>
-                      <div>{t}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-
-            # 이미지(최대 3, 3열)
-            if images:
-                st.markdown('<div class="info-grid">', unsafe_allow_html=True)
-                for url in images[:3]:
-                    st.markdown(f"""
-                    <div class="card" style="grid-column:span 4;">
-                      <h4>이미지</h4>
-                      <img src="{url}" class="thumb" />
-                    </div>
-                    """, unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-
-            # 동영상(유튜브 썸네일)
-            if videos:
-                st.markdown('<div class="info-grid">', unsafe_allow_html=True)
-                for v in videos[:3]:
-                    thumb = yt_thumb(v)
-                    if thumb:
-                        st.markdown(f"""
-                        <div class="card" style="grid-column:span 6;">
-                          <h4>동영상</h4>
-                          <a href="{v}" target="_blank" class="thumb-wrap">
-                            <img src="{thumb}" class="thumb"/>
-                            <div class="play"></div>
-                          </a>
-                          <div class="helper">{v}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                        <div class="card" style="grid-column:span 6;">
-                          <h4>동영상</h4>
-                          <a href="{v}" target="_blank">{v}</a>
-                        </div>
-                        """, unsafe_allow_html=True)
+        content_panel(result.label)
 else:
     st.info("카메라로 촬영하거나 파일을 업로드하면 분석 결과와 라벨별 콘텐츠가 표시됩니다.")
+
+_cs = pred_cache.stats()
+st.sidebar.caption(
+    f"예측 캐시: {_cs['size']}/{_cs['maxsize']} · hit {_cs['hits']} · miss {_cs['misses']} "
+    f"({_cs['hit_rate']*100:.0f}%)"
+)
+with st.sidebar.expander("⏱ 시작 시간"):
+    _phases = startup.as_dict()
+    st.caption(" · ".join(f"{k} {v:.2f}s" for k, v in _phases.items()) + f" · 합계 {sum(_phases.values()):.2f}s")
+_ss = scheduler.stats()
+st.sidebar.caption(
+    f"추론 스케줄러: 대기 {_ss['queued']} · 배치 {_ss['batches']} · 평균 배치 {_ss['avg_batch']:.1f} "
+    f"· 거절 {_ss['rejected']}"
+)
+
+trace.add("script_total", time.perf_counter() - _script_t0)
+trace.emit(backend=backend_name)
+
+# 진단 패널: 단계별 p50/p95/p99 (모든 세션 합산, 최근 METRICS_WINDOW건)
+if st.sidebar.toggle("🔍 진단 패널", value=False):
+    _summary = stage_metrics.summary()
+    if _summary:
+        st.sidebar.dataframe(
+            pd.DataFrame(_summary).T[["count", "p50_ms", "p95_ms", "p99_ms"]].round(2),
+            use_container_width=True,
+        )
+    st.sidebar.download_button("지표 JSON 내보내기", stage_metrics.export_json(),
+                               file_name="stage_metrics.json", mime="application/json")
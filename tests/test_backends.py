@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+from backends import prepare_image, preprocess_spec
+
+
+def _learner(item_tfms, batch_tfms=()):
+    dls = SimpleNamespace(after_item=SimpleNamespace(fs=list(item_tfms)),
+                          after_batch=SimpleNamespace(fs=list(batch_tfms)), vocab=["a", "b"])
+    return SimpleNamespace(dls=dls)
+
+
+class Resize:
+    """fastai Resize 흉내: Resize((h, w))는 size를 (w, h)로 저장한다."""
+
+    def __init__(self, size, method="crop"):
+        self.size = (size, size) if isinstance(size, int) else (size[1], size[0])
+        self.method = method
+
+
+def test_non_square_size_is_height_width():
+    spec = preprocess_spec(_learner([Resize((200, 300))]))
+    assert spec["size"] == [200, 300]
+    out = prepare_image(Image.new("RGB", (640, 480)), spec["size"], spec["method"])
+    assert out.shape == (200, 300, 3)
+
+
+def test_square_int_size_and_default_normalization():
+    spec = preprocess_spec(_learner([Resize(224, method="squish")]))
+    assert spec["size"] == [224, 224] and spec["method"] == "squish"
+    assert spec["mean"] == [0.0, 0.0, 0.0] and spec["std"] == [1.0, 1.0, 1.0]
+
+
+def test_normalize_is_read_from_batch_tfms():
+    Normalize = type("Normalize", (), {})
+    norm = Normalize()
+    norm.mean, norm.std = np.array([[0.5, 0.4, 0.3]]), np.array([[0.2, 0.2, 0.2]])
+    spec = preprocess_spec(_learner([Resize(64)], [norm]))
+    assert np.allclose(spec["mean"], [0.5, 0.4, 0.3]) and np.allclose(spec["std"], [0.2, 0.2, 0.2])
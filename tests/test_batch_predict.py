@@ -0,0 +1,82 @@
+import io
+import zipfile
+
+import numpy as np
+from PIL import Image
+
+from batch_predict import count_upload_images, iter_upload_bytes, predict_batches
+from prediction_cache import Prediction
+
+
+class Upload(io.BytesIO):
+    """streamlit UploadedFile 흉내 (name + getvalue + seek)."""
+
+    def __init__(self, name: str, data: bytes):
+        super().__init__(data)
+        self.name = name
+
+
+def _png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def _predict(imgs):
+    return [Prediction("a", 0, np.array([1.0, 0.0], dtype=np.float32)) for _ in imgs]
+
+
+def _run(files):
+    rows = []
+    for chunk in predict_batches(iter_upload_bytes(files), lambda b: Image.open(io.BytesIO(b)), _predict,
+                                 batch_size=2):
+        rows.extend(chunk)
+    return rows
+
+
+def test_zip_members_are_expanded():
+    files = [Upload("a.zip", _zip({"x.png": _png(), "y.jpg": _png(), "notes.txt": b"hi"})), Upload("z.png", _png())]
+    assert count_upload_images(files) == 3
+    rows = _run(files)
+    assert [r.name for r in rows] == ["a.zip/x.png", "a.zip/y.jpg", "z.png"]
+    assert all(r.error is None for r in rows)
+
+
+def test_bad_zip_becomes_error_row():
+    files = [Upload("broken.zip", b"not a zip"), Upload("ok.png", _png())]
+    assert count_upload_images(files) == 2
+    rows = _run(files)
+    assert rows[0].name == "broken.zip" and rows[0].pred is None and "BadZipFile" in rows[0].error
+    assert rows[1].error is None and rows[1].pred.label == "a"
+
+
+def _patch_central_dir(data: bytes, offset: int, value: bytes) -> bytes:
+    """첫 멤버의 central directory 헤더 필드를 덮어씀 (암호화 플래그, 압축 방식 등)."""
+    i = data.index(b"PK\x01\x02") + offset
+    return data[:i] + value + data[i + len(value):]
+
+
+def test_encrypted_member_becomes_error_row():
+    data = _patch_central_dir(_zip({"secret.png": _png()}), 8, b"\x01\x00")   # 암호화 플래그
+    rows = _run([Upload("enc.zip", data), Upload("ok.png", _png())])
+    assert rows[0].name == "enc.zip/secret.png" and "RuntimeError" in rows[0].error
+    assert rows[1].error is None
+
+
+def test_unsupported_compression_becomes_error_row():
+    data = _patch_central_dir(_zip({"x.png": _png()}), 10, b"\x63\x00")   # 99 = AES
+    rows = _run([Upload("aes.zip", data)])
+    assert "NotImplementedError" in rows[0].error
+
+
+def test_broken_image_becomes_error_row():
+    rows = _run([Upload("bad.png", b"garbage")])
+    assert rows[0].pred is None and rows[0].error
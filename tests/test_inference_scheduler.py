@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+
+from inference_scheduler import InferenceScheduler, SchedulerBusy
+
+
+def _double(xs):
+    return [x * 2 for x in xs]
+
+
+@pytest.fixture
+def make():
+    made = []
+
+    def _make(predict_batch=_double, **kw):
+        s = InferenceScheduler(predict_batch, **kw)
+        made.append(s)
+        return s
+
+    yield _make
+    for s in made:
+        s.stop()
+
+
+def test_concurrent_requests_are_batched(make):
+    sizes = []
+
+    def predict_batch(xs):
+        sizes.append(len(xs))
+        time.sleep(0.01)
+        return _double(xs)
+
+    s = make(predict_batch, max_batch_size=8, max_wait_ms=50)
+    futs = [s.submit(i) for i in range(8)]
+    assert [f.result(timeout=2) for f in futs] == [i * 2 for i in range(8)]
+    assert max(sizes) > 1
+    assert s.stats()["items"] == 8
+
+
+def test_full_queue_raises_busy(make):
+    gate = threading.Event()
+    s = make(lambda xs: (gate.wait(2), _double(xs))[1], max_batch_size=1, max_queue=1)
+    s.submit(0)              # 워커가 집어가서 gate에서 대기
+    time.sleep(0.05)
+    s.submit(1)              # 큐 한 칸
+    with pytest.raises(SchedulerBusy):
+        s.submit(2)
+    gate.set()
+    assert s.stats()["rejected"] == 1
+
+
+def test_timeout_cancels_queued_request(make):
+    gate = threading.Event()
+    s = make(lambda xs: (gate.wait(2), _double(xs))[1], max_batch_size=1)
+    first = s.submit(0)      # 워커를 붙잡아 둠
+    time.sleep(0.05)
+    with pytest.raises(TimeoutError):
+        s.predict(1, timeout=0.01)
+    gate.set()
+    assert first.result(timeout=2) == 0
+    time.sleep(0.2)
+    assert s.stats()["items"] == 1   # 시간 초과된 요청은 forward를 돌지 않음
+
+
+def test_errors_propagate_to_callers(make):
+    def boom(xs):
+        raise ValueError("bad input")
+
+    s = make(boom)
+    with pytest.raises(ValueError):
+        s.predict(1, timeout=2)
+
+
+def test_predict_many_slices_by_max_batch(make):
+    sizes = []
+
+    def predict_batch(xs):
+        sizes.append(len(xs))
+        return _double(xs)
+
+    s = make(predict_batch, max_batch_size=4, max_wait_ms=1)
+    assert s.predict_many(list(range(10)), timeout=2) == [i * 2 for i in range(10)]
+    assert max(sizes) <= 4
+
+
+def test_predict_many_uses_slice_size_as_forward_batch(make):
+    sizes = []
+
+    def predict_batch(xs):
+        sizes.append(len(xs))
+        return _double(xs)
+
+    s = make(predict_batch, max_batch_size=4, max_wait_ms=1)
+    assert s.predict_many(list(range(20)), timeout=2, slice_size=8) == [i * 2 for i in range(20)]
+    assert sizes == [8, 8, 4]   # max_batch_size(4)와 무관하게 조각 하나가 forward 하나
+
+
+def test_interactive_request_runs_between_slices(make):
+    order = []
+    first_slice = threading.Event()
+
+    def predict_batch(xs):
+        order.append(len(xs))
+        if len(xs) == 8 and not first_slice.is_set():
+            first_slice.set()
+            time.sleep(0.1)   # 첫 조각이 도는 동안 대화형 요청이 큐에 들어옴
+        return _double(xs)
+
+    s = make(predict_batch, max_batch_size=4, max_wait_ms=1)
+    t = threading.Thread(target=s.predict_many, args=(list(range(24)),), kwargs={"timeout": 2, "slice_size": 8})
+    t.start()
+    first_slice.wait(2)
+    assert s.predict(100, timeout=2) == 200
+    t.join(2)
+    assert order.index(1) < len(order) - 1   # 남은 조각들보다 먼저 처리됨
+
+
+def test_shared_model_lock_serializes_forwards(make):
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def predict_batch(xs):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        active[0] -= 1
+        return _double(xs)
+
+    a = make(predict_batch, model_lock=lock)
+    b = make(predict_batch, model_lock=lock)
+    futs = [s.submit(i) for i in range(5) for s in (a, b)]
+    for f in futs:
+        f.result(timeout=2)
+    assert peak[0] == 1
@@ -0,0 +1,29 @@
+from PIL import Image
+
+from label_content import build_label_content, cache_thumbnail, resolve_labels
+
+
+def test_thumbnail_url_follows_image_contents(tmp_path):
+    src = tmp_path / "a.jpg"
+    Image.new("RGB", (64, 64), "red").save(src)
+    first = cache_thumbnail("a.jpg", str(tmp_path), str(tmp_path / "assets"), "app/static/assets")
+    assert cache_thumbnail("a.jpg", str(tmp_path), str(tmp_path / "assets"), "app/static/assets") == first
+    Image.new("RGB", (64, 64), "blue").save(src)   # 같은 경로, 다른 이미지
+    second = cache_thumbnail("a.jpg", str(tmp_path), str(tmp_path / "assets"), "app/static/assets")
+    assert second != first
+    assert second.split("?v=")[1] != first.split("?v=")[1]
+
+
+def test_non_list_fields_are_reported():
+    resolved, problems = resolve_labels({"a": {"texts": "oops", "images": ["x.jpg", 3]}}, ["a"])
+    assert resolved["a"] == {"texts": [], "images": ["x.jpg"], "videos": []}
+    assert any("texts" in p for p in problems)
+    assert any("images" in p for p in problems)
+
+
+def test_build_skips_bad_texts(tmp_path):
+    manifest = tmp_path / "labels.json"
+    manifest.write_text('{"a": {"texts": "oops"}, "#1": {"texts": ["hello"]}}')
+    html, problems = build_label_content(str(manifest), ["a", "b"], str(tmp_path / "assets"), "u")
+    assert "a" not in html and "hello" in html["b"]
+    assert problems
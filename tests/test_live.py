@@ -0,0 +1,80 @@
+import threading
+import time
+
+import numpy as np
+
+from live import LiveClassifier, play, synthetic_frames
+from prediction_cache import Prediction
+
+VOCAB = ["a", "b", "c"]
+
+
+def _stub(forward_s: float = 0.0, probs=None):
+    """forward_s만큼 걸리는 가짜 추론. probs를 주면 호출마다 순서대로 반환."""
+    seq = iter(probs) if probs is not None else None
+
+    def predict(frame):
+        time.sleep(forward_s)
+        p = np.asarray(next(seq) if seq is not None else [0.2, 0.5, 0.3], dtype=np.float32)
+        return Prediction(VOCAB[int(p.argmax())], int(p.argmax()), p)
+
+    return predict
+
+
+def _wait(cond, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+def test_slow_model_drops_frames():
+    clf = LiveClassifier(_stub(0.05), VOCAB, change_threshold=0)
+    play(synthetic_frames(40, size=(48, 64), scene_every=1), fps=200, clf=clf)
+    # 모든 프레임은 추론되거나, 버려지거나, 건너뛴다
+    _wait(lambda: (lambda r: r.inferred + r.dropped + r.skipped == 40)(clf.latest()))
+    clf.stop()
+    r = clf.latest()
+    assert r.frames_in == 40
+    assert r.dropped > 0 and r.inferred < 40
+
+
+def test_static_scene_is_skipped():
+    clf = LiveClassifier(_stub(), VOCAB, change_threshold=2.0)
+    play(synthetic_frames(20, size=(48, 64), scene_every=1000), fps=100, clf=clf)
+    _wait(lambda: (lambda r: r.inferred + r.dropped + r.skipped == 20)(clf.latest()))
+    clf.stop()
+    r = clf.latest()
+    assert r.skipped > 0
+    assert r.inferred == 1   # 장면이 그대로면 첫 프레임만 추론
+    assert r.label == "b"
+
+
+def test_probs_are_mean_over_window():
+    outs = [[1, 0, 0], [0, 1, 0], [0, 0, 1], [0, 1, 0], [0, 0, 1]]
+    clf = LiveClassifier(_stub(probs=outs), VOCAB, window=3, change_threshold=0)
+    for i, frame in enumerate(synthetic_frames(len(outs), size=(32, 32), scene_every=1)):
+        clf.submit(frame)
+        _wait(lambda: clf.latest().inferred == i + 1)
+    clf.stop()
+    r = clf.latest()
+    np.testing.assert_allclose(r.probs, np.mean(outs[-3:], axis=0), rtol=1e-6)
+    assert r.label == "c"
+
+
+def test_stops_after_idle_timeout():
+    clf = LiveClassifier(_stub(), VOCAB, idle_timeout=0.2)
+    assert clf.running
+    _wait(lambda: not clf.running, timeout=2)
+
+
+def test_stops_when_nobody_polls():
+    clf = LiveClassifier(_stub(), VOCAB, change_threshold=0, poll_timeout=0.2)
+    stop = threading.Event()
+    player = threading.Thread(target=play, args=(synthetic_frames(1000, size=(32, 32), scene_every=1), 50, clf, stop))
+    player.start()
+    _wait(lambda: not clf.running, timeout=2)   # latest()를 부르지 않음 → 탭이 닫힌 것으로 봄
+    player.join(timeout=1)
+    assert not player.is_alive()                # 재생 스레드도 따라서 끝남
+    stop.set()
@@ -0,0 +1,119 @@
+import hashlib
+import os
+
+import pytest
+
+from model_store import LocalFileSource, ModelIntegrityError, ModelStore
+
+DATA = b"PK\x03\x04" + bytes(range(256)) * 40   # torch zip 아카이브처럼 시작
+
+
+@pytest.fixture
+def src(tmp_path):
+    p = tmp_path / "upstream.pkl"
+    p.write_bytes(DATA)
+    return LocalFileSource(str(p))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ModelStore(str(tmp_path / "models"), keep=2)
+
+
+def _sha(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
+
+
+def test_fetch_verifies_and_writes_marker(store, src):
+    m = store.fetch(src, "v1", sha256=_sha(DATA), size=len(DATA))
+    assert open(m.path, "rb").read() == DATA
+    assert m.sha256 == _sha(DATA)
+    assert open(m.path + ".sha256").read() == _sha(DATA)
+    assert not os.path.exists(m.path + ".part")
+
+
+def test_resumes_from_partial_part_file(store, src):
+    path = os.path.join(store.version_dir("v1"), "model.pkl")
+    os.makedirs(os.path.dirname(path))
+    with open(path + ".part", "wb") as f:
+        f.write(DATA[:4] + b"\0" * 996)   # 앞부분을 일부러 다르게: 이어받았다면 그대로 남는다
+    m = store.fetch(src, "v1")
+    assert open(m.path, "rb").read() == DATA[:4] + b"\0" * 996 + DATA[1000:]
+
+
+def test_checksum_mismatch_removes_part(store, src):
+    with pytest.raises(ModelIntegrityError):
+        store.fetch(src, "v1", sha256="0" * 64)
+    d = store.version_dir("v1")
+    assert os.listdir(d) == []
+
+
+def test_failed_download_never_exposes_final_path(store, src):
+    class Flaky(LocalFileSource):
+        def fetch(self, dest):
+            with open(dest, "wb") as f:
+                f.write(DATA[:500])
+            raise OSError("connection reset")
+
+    path = os.path.join(store.version_dir("v1"), "model.pkl")
+    with pytest.raises(OSError):
+        store.fetch(Flaky(src.path), "v1", retries=0)
+    assert not os.path.exists(path)
+    assert os.path.getsize(path + ".part") == 500
+    m = store.fetch(src, "v1", sha256=_sha(DATA))   # 남은 .part에서 이어받아 완성
+    assert open(m.path, "rb").read() == DATA
+
+
+def test_corrupted_cached_file_is_refetched(store, src):
+    m = store.fetch(src, "v1")
+    with open(m.path, "r+b") as f:
+        f.write(b"\xff\xff")
+    st = os.stat(m.path + ".sha256")
+    os.utime(m.path, (st.st_atime, st.st_mtime + 5))   # 파일이 marker보다 새로움
+    again = store.fetch(src, "v1")
+    assert open(again.path, "rb").read() == DATA
+
+
+def test_size_mismatch_is_refetched_even_with_marker(store, src):
+    m = store.fetch(src, "v1", size=len(DATA))
+    with open(m.path, "ab") as f:
+        f.write(b"extra")
+    os.utime(m.path + ".sha256")   # marker가 더 새로워도 크기는 검사
+    again = store.fetch(src, "v1", size=len(DATA))
+    assert os.path.getsize(again.path) == len(DATA)
+
+
+def test_nested_filename_and_rejects_escape(store, src):
+    m = store.fetch(src, "v1", filename="sub/model.pkl")
+    assert m.path == os.path.join(store.version_dir("v1"), "sub", "model.pkl")
+    with pytest.raises(ValueError):
+        store.fetch(src, "v1", filename="../model.pkl")
+    with pytest.raises(ValueError):
+        store.fetch(src, "v1", filename=os.path.abspath("model.pkl"))
+
+
+def test_prunes_old_versions_and_finds_latest(store, src):
+    for i, v in enumerate(["v1", "v2"]):
+        store.fetch(src, v)
+        t = 1_000_000 + i * 100
+        os.utime(store.version_dir(v), (t, t))
+        os.utime(os.path.join(store.version_dir(v), "model.pkl"), (t, t))
+    m = store.fetch(src, "v3")
+    assert sorted(os.listdir(store.root)) == ["v2", "v3"]
+    assert store.latest() == m.path
+
+
+def test_unpinned_download_must_look_like_torch_zip(store, tmp_path, caplog):
+    page = tmp_path / "error.html"
+    page.write_bytes(b"<!DOCTYPE html><html>quota exceeded</html>")
+    with pytest.raises(ModelIntegrityError):
+        store.fetch(LocalFileSource(str(page)), "v1")
+    assert os.listdir(store.version_dir("v1")) == []
+    assert "MODEL_SHA256" in caplog.text
+
+
+def test_pinned_checksum_skips_format_check(store, tmp_path):
+    raw = tmp_path / "legacy.pkl"
+    raw.write_bytes(b"\x80\x02legacy pickle")
+    m = store.fetch(LocalFileSource(str(raw)), "v1", sha256=_sha(raw.read_bytes()))
+    assert os.path.exists(m.path)
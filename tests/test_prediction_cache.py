@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from prediction_cache import Prediction, PredictionCache, image_digest, prediction_key
+
+
+def _pred(label="a", idx=0, n=3):
+    probs = np.zeros(n, dtype=np.float64)
+    probs[idx] = 1.0
+    return Prediction(label, idx, probs)
+
+
+def test_key_depends_on_bytes_and_model():
+    d1, d2 = image_digest(b"one"), image_digest(b"two")
+    assert d1 != d2
+    assert image_digest(b"one") == d1
+    assert prediction_key(d1, "m1") != prediction_key(d1, "m2")
+
+
+def test_put_normalizes_and_freezes_probs():
+    cache = PredictionCache(maxsize=4)
+    stored = cache.put("k", _pred())
+    assert stored.probs.dtype == np.float32
+    with pytest.raises(ValueError):
+        stored.probs[0] = 0.5
+    assert cache.get("k") is stored
+
+
+def test_lru_eviction():
+    cache = PredictionCache(maxsize=2)
+    cache.put("a", _pred("a"))
+    cache.put("b", _pred("b"))
+    assert cache.get("a") is not None   # a가 최근 사용 → b가 밀려남
+    cache.put("c", _pred("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("prediction_cache.time.monotonic", lambda: now[0])
+    cache = PredictionCache(maxsize=4, ttl=10)
+    cache.put("k", _pred())
+    now[0] += 5
+    assert cache.get("k") is not None
+    now[0] += 6
+    assert cache.get("k") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_get_or_compute_runs_once():
+    cache = PredictionCache(maxsize=4)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return _pred("x", 1)
+
+    first = cache.get_or_compute("k", compute)
+    second = cache.get_or_compute("k", compute)
+    assert len(calls) == 1
+    assert first is second and first.label == "x"
+    s = cache.stats()
+    assert (s["hits"], s["misses"]) == (1, 1)
@@ -0,0 +1,70 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from benchmark import synthetic_jpeg
+from preprocess import ImageTooLarge, decode_image
+from timing import Trace
+
+
+def _png(w: int, h: int, mode: str = "RGB") -> bytes:
+    buf = BytesIO()
+    Image.new(mode, (w, h)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def test_byte_limit():
+    b = synthetic_jpeg(64, 64, seed=0)
+    with pytest.raises(ImageTooLarge):
+        decode_image(b, max_bytes=len(b) - 1)
+
+
+def test_header_pixel_limit():
+    with pytest.raises(ImageTooLarge):
+        decode_image(_png(20, 20), max_pixels=399)
+    assert decode_image(_png(20, 20), max_pixels=400).work.size == (20, 20)
+
+
+def test_decompression_bomb_is_image_too_large(monkeypatch):
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)   # 64x64 > 2 * 100 → Image.open에서 폭탄 오류
+    with pytest.raises(ImageTooLarge):
+        decode_image(_png(64, 64))
+
+
+def test_jpeg_draft_keeps_short_side_at_least_min_side():
+    decoded = decode_image(synthetic_jpeg(1600, 1200, seed=1), min_side=224)
+    assert min(decoded.work.size) == 224
+    assert decoded.work.size == (299, 224)
+    assert decoded.preview is None
+
+
+def test_target_is_larger_of_min_side_and_preview():
+    decoded = decode_image(synthetic_jpeg(1600, 1200, seed=1), min_side=224, preview_max=512)
+    assert min(decoded.work.size) == 512
+    assert max(decoded.preview.size) == 512
+
+
+def test_small_image_is_not_upscaled():
+    decoded = decode_image(synthetic_jpeg(200, 150, seed=2), min_side=224)
+    assert decoded.work.size == (200, 150)
+
+
+def test_exif_orientation_swaps_width_and_height():
+    decoded = decode_image(synthetic_jpeg(400, 300, seed=3, orientation=6))
+    assert decoded.work.size == (300, 400)
+    decoded = decode_image(synthetic_jpeg(1600, 1200, seed=3, orientation=6), min_side=224)
+    assert decoded.work.size == (224, 299)
+
+
+def test_png_fallback_resize_and_rgb():
+    decoded = decode_image(_png(800, 600, "RGBA"), min_side=100, preview_max=64)
+    assert decoded.work.size == (133, 100)
+    assert decoded.work.mode == "RGB"
+    assert max(decoded.preview.size) <= 64
+
+
+def test_trace_records_stages():
+    trace = Trace()
+    decode_image(synthetic_jpeg(640, 480, seed=4), min_side=224, preview_max=128, trace=trace)
+    assert set(trace.stages) == {"decode", "exif_transpose", "resize", "preview"}
@@ -0,0 +1,119 @@
+# timing.py
+# 구간별 시간 측정: 시작 시간 분해(PhaseTimer), 요청 단계별 지연시간 분포(StageMetrics/Trace)
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+log = logging.getLogger("metrics")
+
+
+class PhaseTimer:
+    """이름 붙은 구간의 누적 소요 시간(초). 시작 시간 분해(import/다운로드/로드/워밍업) 보고용."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + dt
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self.phases.values())
+
+    def as_dict(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self.phases)
+
+
+class StageMetrics:
+    """단계별 최근 window개 측정값(초)을 보관하고 p50/p95/p99를 계산. 여러 세션이 공유."""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self.window)
+                self._counts[name] = 0
+            self._samples[name].append(seconds)
+            self._counts[name] += 1
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t0)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """{단계: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} (최근 window 기준, count는 누적)."""
+        with self._lock:
+            snap = {k: (np.array(v), self._counts[k]) for k, v in self._samples.items()}
+        out = {}
+        for name, (arr, count) in snap.items():
+            if not len(arr):
+                continue
+            ms = arr * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            out[name] = {"count": count, "mean_ms": float(ms.mean()), "p50_ms": float(p50),
+                         "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(ms.max())}
+        return out
+
+    def export_json(self) -> str:
+        return json.dumps({"ts": time.time(), "window": self.window, "stages": self.summary()},
+                          ensure_ascii=False)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+class Trace:
+    """요청(스크립트 실행) 하나의 단계별 시간. StageMetrics에도 함께 기록하고 끝에 JSON 한 줄로 로깅."""
+
+    def __init__(self, metrics: StageMetrics | None = None):
+        self.metrics = metrics
+        self.stages: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        if self.metrics is not None:
+            self.metrics.record(name, seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def emit(self, **fields) -> None:
+        if self.stages:
+            log.info(json.dumps({"event": "request", **fields,
+                                 "stages_ms": {k: round(v * 1000, 3) for k, v in self.stages.items()}},
+                                ensure_ascii=False))
+
+
+def stage_of(trace: "Trace | StageMetrics | None", name: str):
+    """trace(또는 StageMetrics)가 없으면 아무 것도 하지 않는 컨텍스트."""
+    return trace.stage(name) if trace is not None else nullcontext()